@@ -1,14 +1,18 @@
 """Application configuration using Pydantic settings."""
 
-import os
+from functools import lru_cache
 from pathlib import Path
 from typing import List
+from pydantic import PrivateAttr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
+    _upload_path: Path = PrivateAttr()
+    _processed_path: Path = PrivateAttr()
+
     # API Keys
     GEMINI_API_KEY: str
     PERPLEXITY_API_KEY: str = ""
@@ -16,6 +20,12 @@ class Settings(BaseSettings):
     # Database
     MONGODB_URL: str = "mongodb://localhost:27017"
     DATABASE_NAME: str = "video_generator"
+    MONGO_MIN_POOL: int = 5
+    MONGO_MAX_POOL: int = 50
+    MONGO_IDLE_MS: int = 30000
+
+    # Task queue (optional — falls back to in-process BackgroundTasks)
+    REDIS_URL: str = ""
 
     # Storage (local fallback — not used when S3 is configured)
     UPLOAD_DIR: str = "./storage/uploads"
@@ -44,6 +54,12 @@ class Settings(BaseSettings):
         case_sensitive=True
     )
 
+    def model_post_init(self, __context) -> None:
+        """Resolve storage paths once — resolve() stats the filesystem,
+        so the properties below must not do it per access."""
+        self._upload_path = Path(self.UPLOAD_DIR).resolve()
+        self._processed_path = Path(self.PROCESSED_DIR).resolve()
+
     @property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS_ORIGINS string into a list."""
@@ -51,13 +67,13 @@ class Settings(BaseSettings):
 
     @property
     def upload_path(self) -> Path:
-        """Get absolute path to uploads directory."""
-        return Path(self.UPLOAD_DIR).resolve()
+        """Absolute path to uploads directory (resolved at init)."""
+        return self._upload_path
 
     @property
     def processed_path(self) -> Path:
-        """Get absolute path to processed directory."""
-        return Path(self.PROCESSED_DIR).resolve()
+        """Absolute path to processed directory (resolved at init)."""
+        return self._processed_path
 
     @property
     def use_s3(self) -> bool:
@@ -69,5 +85,14 @@ class Settings(BaseSettings):
         Path("/tmp/video_processing").mkdir(parents=True, exist_ok=True)
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the shared Settings instance.
+
+    Lazily created on first call (and cached), so importing this module
+    doesn't pay Pydantic's env parsing cost and tests can set env vars
+    before settings are first read. Also usable as a FastAPI dependency
+    via Depends(get_settings).
+    """
+    return Settings()
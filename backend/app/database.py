@@ -1,7 +1,9 @@
 """MongoDB database connection using Motor (async driver)."""
 
+import asyncio
+
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from app.config import settings
+from app.config import get_settings
 
 
 class Database:
@@ -9,12 +11,27 @@ class Database:
 
     client: AsyncIOMotorClient = None
     db: AsyncIOMotorDatabase = None
+    indexes_ready: asyncio.Task = None  # Set once index creation is scheduled
 
     @classmethod
     async def connect_db(cls):
         """Initialize database connection on startup."""
-        cls.client = AsyncIOMotorClient(settings.MONGODB_URL)
+        settings = get_settings()
+        cls.client = AsyncIOMotorClient(
+            settings.MONGODB_URL,
+            minPoolSize=settings.MONGO_MIN_POOL,
+            maxPoolSize=settings.MONGO_MAX_POOL,
+            maxIdleTimeMS=settings.MONGO_IDLE_MS,
+            serverSelectionTimeoutMS=3000,
+            uuidRepresentation="standard",
+        )
         cls.db = cls.client[settings.DATABASE_NAME]
+
+        # Force the handshake now so the first request doesn't pay
+        # TCP + TLS + auth latency, and warm the hot collection.
+        await cls.client.admin.command("ping")
+        await cls.db["videos"].find_one({"_id": "__warmup__"})
+
         print(f"✓ Connected to MongoDB: {settings.DATABASE_NAME}")
 
     @classmethod
@@ -40,9 +57,18 @@ async def create_indexes():
     """Create database indexes for better performance."""
     videos = get_videos_collection()
 
-    # Create indexes
-    await videos.create_index("status")
-    await videos.create_index("upload_timestamp")
-    await videos.create_index([("upload_timestamp", -1)])  # Descending for recent first
+    # Create indexes concurrently — idempotent, so safe on every startup.
+    # The compound status_ts_desc index covers both "filter by status" and
+    # "recent first" listings with no in-memory sort, and its status prefix
+    # makes a single-field status index redundant. MongoDB walks single-key
+    # indexes in either direction, so only the descending upload_timestamp
+    # index is kept. Existing deployments should dropIndex("status_1") and
+    # dropIndex("upload_timestamp_1") once.
+    await asyncio.gather(
+        videos.create_index(
+            [("status", 1), ("upload_timestamp", -1)], name="status_ts_desc"
+        ),
+        videos.create_index([("upload_timestamp", -1)]),  # Descending for recent first
+    )
 
     print("✓ Created database indexes")
@@ -1,11 +1,14 @@
 """FastAPI application entry point."""
 
+import asyncio
 from contextlib import asynccontextmanager
+
+import anyio.to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 
-from app.config import settings
+from app.config import get_settings
 from app.database import Database, create_indexes
 from app.routes import video
 
@@ -17,6 +20,10 @@ async def lifespan(app: FastAPI):
     Handles startup and shutdown events.
     """
     # Startup
+    from app.utils.logging_config import setup_logging
+    setup_logging()
+
+    settings = get_settings()
     print("\n" + "="*50)
     print("🚀 Starting Video Headline & Template Generator API")
     print("="*50)
@@ -25,11 +32,17 @@ async def lifespan(app: FastAPI):
     import sys
     print(f"✓ Python: {sys.executable}")
 
+    # Widen the shared anyio thread pool (default 40) so FileResponse
+    # sendfile work and other run_sync offloads don't starve each other
+    import os
+    anyio.to_thread.current_default_thread_limiter().total_tokens = max(
+        64, (os.cpu_count() or 1) * 8
+    )
+
     # Ensure storage directories exist
     settings.ensure_directories()
 
     # Check available fonts
-    import os
     linux_font = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
     if os.path.exists(linux_font):
         print(f"✓ Linux fonts available: DejaVu")
@@ -54,8 +67,17 @@ async def lifespan(app: FastAPI):
     # Connect to MongoDB
     await Database.connect_db()
 
-    # Create database indexes
-    await create_indexes()
+    # Connect optional task queue (Arq / Redis) for heavy video jobs
+    from app.task_queue import create_arq_pool
+    app.state.arq = await create_arq_pool()
+
+    # Pre-warm the Gemini connection pool off the critical path
+    from app.services.gemini_service import GeminiService
+    app.state.gemini_warmup = asyncio.create_task(GeminiService().warmup())
+
+    # Create database indexes in the background so the HTTP socket
+    # accepts traffic immediately (indexes are a no-op after first deploy)
+    Database.indexes_ready = asyncio.create_task(create_indexes())
 
     print("="*50)
     print(f"✓ Server ready at http://{settings.HOST}:{settings.PORT}")
@@ -66,6 +88,8 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     print("\n🛑 Shutting down server...")
+    if app.state.arq is not None:
+        await app.state.arq.close()
     await Database.close_db()
     print("✓ Server shutdown complete\n")
 
@@ -75,13 +99,14 @@ app = FastAPI(
     title="Video Headline & Template Generator API",
     description="AI-powered video processing API for generating headlines and converting videos to 9:16 format",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse  # C-speed JSON with native datetime support
 )
 
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.cors_origins_list,
+    allow_origins=get_settings().cors_origins_list,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -116,13 +141,21 @@ async def root():
 # Health check endpoint
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
+    """Health check endpoint (liveness — always 200 while the process runs)."""
     return {
         "status": "healthy",
         "database": "connected" if Database.db is not None else "disconnected"
     }
 
 
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness check — 503 until startup index creation has finished."""
+    if Database.indexes_ready is None or not Database.indexes_ready.done():
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return {"status": "ready"}
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
@@ -132,16 +165,29 @@ async def global_exception_handler(request, exc):
         status_code=500,
         content={
             "error": "Internal server error",
-            "detail": str(exc) if settings.DEBUG else "An unexpected error occurred"
+            "detail": str(exc) if get_settings().DEBUG else "An unexpected error occurred"
         }
     )
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
+    settings = get_settings()
+
+    # Prefer the C event loop / HTTP parser when available (not on Windows)
+    try:
+        import uvloop  # noqa: F401
+        loop_impl, http_impl = "uvloop", "httptools"
+    except ImportError:
+        loop_impl, http_impl = "auto", "auto"
+
     uvicorn.run(
         "app.main:app",
         host=settings.HOST,
         port=settings.PORT,
-        reload=settings.DEBUG
+        loop=loop_impl,
+        http=http_impl,
+        reload=settings.DEBUG,
+        workers=1 if settings.DEBUG else os.cpu_count()
     )
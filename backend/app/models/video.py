@@ -1,10 +1,9 @@
 """Video data models for MongoDB documents."""
 
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Optional, Dict, List
-from pydantic import BaseModel, Field
-from bson import ObjectId
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class VideoStatus(str, Enum):
@@ -82,16 +81,12 @@ class VideoDocument(BaseModel):
     show_location: bool = True
 
     # Metadata
-    upload_timestamp: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    upload_timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     user_id: Optional[str] = None
 
-    class Config:
-        populate_by_name = True
-        json_encoders = {
-            ObjectId: str,
-            datetime: lambda v: v.isoformat()
-        }
+    # orjson serializes datetime natively (RFC 3339), so no custom encoders
+    model_config = ConfigDict(populate_by_name=True)
 
     def get_final_headline(self) -> str:
         """Get the final headline (user override or generated)."""
@@ -1,12 +1,21 @@
 """Video API endpoints."""
 
-from datetime import datetime
+import asyncio
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
-from fastapi import APIRouter, UploadFile, File, HTTPException, status, BackgroundTasks
-from fastapi.responses import FileResponse, StreamingResponse
+
+from fastapi import (
+    APIRouter, UploadFile, File, HTTPException, status, BackgroundTasks,
+    Request, WebSocket, WebSocketDisconnect
+)
+from fastapi.responses import FileResponse, ORJSONResponse, RedirectResponse
 from bson import ObjectId
+from pydantic import TypeAdapter
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
 
+from app.config import get_settings
 from app.database import get_videos_collection
 from app.models.video import VideoDocument, VideoStatus
 from app.schemas.video import (
@@ -25,9 +34,45 @@ from app.workers import analyze_video_task, render_video_task
 
 router = APIRouter(prefix="/api/videos", tags=["videos"])
 
+# Compiled once — dump_python reuses the adapter's serialization schema
+# instead of re-introspecting VideoDocument on every upload
+_VIDEO_ADAPTER = TypeAdapter(VideoDocument)
+
+# Status → progress/stage lookups, built once at import instead of per request
+_PROGRESS = {
+    VideoStatus.UPLOADED: 10,
+    VideoStatus.ANALYZING: 40,
+    VideoStatus.ANALYZED: 70,
+    VideoStatus.RENDERING: 90,
+    VideoStatus.COMPLETED: 100,
+    VideoStatus.ERROR: 0
+}
+_STAGE = {
+    VideoStatus.UPLOADED: "upload",
+    VideoStatus.ANALYZING: "analysis",
+    VideoStatus.ANALYZED: "analysis",
+    VideoStatus.RENDERING: "render",
+    VideoStatus.COMPLETED: "finalizing",
+    VideoStatus.ERROR: "error"
+}
+
+
+async def _dispatch_task(request: Request, background_tasks: BackgroundTasks,
+                         job_name: str, task_fn, video_id: str):
+    """
+    Dispatch a heavy job to the Arq queue when configured,
+    falling back to in-process BackgroundTasks.
+    """
+    arq_pool = getattr(request.app.state, "arq", None)
+    if arq_pool is not None:
+        await arq_pool.enqueue_job(job_name, video_id)
+    else:
+        background_tasks.add_task(task_fn, video_id)
+
 
 @router.post("/upload", response_model=VideoUploadResponse, status_code=status.HTTP_201_CREATED)
 async def upload_video(
+    request: Request,
     file: UploadFile = File(...),
     background_tasks: BackgroundTasks = None
 ):
@@ -35,17 +80,31 @@ async def upload_video(
     Upload a video file for processing.
 
     Args:
+        request: Incoming HTTP request (used for early size checks)
         file: Video file (mp4, mov, avi, mkv)
         background_tasks: FastAPI background tasks
 
     Returns:
         VideoUploadResponse with video_id and status
     """
+    # Reject oversize/wrong-type uploads up front, before consuming the
+    # body. The streaming save path still enforces the size cap for
+    # chunked uploads that omit Content-Length.
+    content_length = request.headers.get("content-length")
+    max_size = get_settings().MAX_FILE_SIZE
+    if content_length and content_length.isdigit() and int(content_length) > max_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File too large. Max: {max_size // (1024*1024)}MB"
+        )
+    StorageService.validate_video_file(file)
+
     try:
         # Save file to storage
         video_id, file_path, file_size = await StorageService.save_uploaded_file(file)
 
-        # Create MongoDB document
+        # Create MongoDB document (single aware timestamp, reused)
+        now = datetime.now(timezone.utc)
         video_doc = VideoDocument(
             id=video_id,
             filename=f"{video_id}{Path(file.filename).suffix}",
@@ -53,14 +112,14 @@ async def upload_video(
             status=VideoStatus.UPLOADED,
             original_path=file_path,
             file_size=file_size,
-            upload_timestamp=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            upload_timestamp=now,
+            updated_at=now
         )
 
-        # Insert into database
+        # Insert into database — id is already set, so the `_id` alias
+        # serializes directly without the old exclude + re-assign two-step
         collection = get_videos_collection()
-        doc_dict = video_doc.model_dump(by_alias=True, exclude={"id"})
-        doc_dict["_id"] = video_id
+        doc_dict = _VIDEO_ADAPTER.dump_python(video_doc, by_alias=True)
         await collection.insert_one(doc_dict)
 
         # TODO: Trigger analysis in background
@@ -81,7 +140,10 @@ async def upload_video(
         )
 
 
-@router.get("/{video_id}/status", response_model=VideoStatusResponse)
+# No response_model here on purpose: this is the hottest endpoint (client
+# polling) and FastAPI's response validation would re-validate + re-build a
+# Pydantic model per request. The schema stays in OpenAPI via `responses`.
+@router.get("/{video_id}/status", responses={200: {"model": VideoStatusResponse}})
 async def get_video_status(video_id: str):
     """
     Get current processing status of a video.
@@ -93,7 +155,11 @@ async def get_video_status(video_id: str):
         VideoStatusResponse with current status
     """
     collection = get_videos_collection()
-    video = await collection.find_one({"_id": video_id})
+    # Status polling is the hottest endpoint — only fetch what we return
+    video = await collection.find_one(
+        {"_id": video_id},
+        {"status": 1, "error_message": 1}
+    )
 
     if not video:
         raise HTTPException(
@@ -101,37 +167,83 @@ async def get_video_status(video_id: str):
             detail="Video not found"
         )
 
-    # Calculate progress based on status
-    progress_map = {
-        VideoStatus.UPLOADED: 10,
-        VideoStatus.ANALYZING: 40,
-        VideoStatus.ANALYZED: 70,
-        VideoStatus.RENDERING: 90,
-        VideoStatus.COMPLETED: 100,
-        VideoStatus.ERROR: 0
-    }
+    return ORJSONResponse({
+        "video_id": video_id,
+        "status": video["status"],
+        "progress_percent": _PROGRESS.get(video["status"], 0),
+        "stage": _STAGE.get(video["status"], "unknown"),
+        "error": video.get("error_message")
+    })
 
-    # Determine stage
-    stage_map = {
-        VideoStatus.UPLOADED: "upload",
-        VideoStatus.ANALYZING: "analysis",
-        VideoStatus.ANALYZED: "analysis",
-        VideoStatus.RENDERING: "render",
-        VideoStatus.COMPLETED: "finalizing",
-        VideoStatus.ERROR: "error"
-    }
 
-    return VideoStatusResponse(
-        video_id=video_id,
-        status=video["status"],
-        progress_percent=progress_map.get(video["status"], 0),
-        stage=stage_map.get(video["status"], "unknown"),
-        error=video.get("error_message")
-    )
+@router.websocket("/{video_id}/stream")
+async def stream_video_status(websocket: WebSocket, video_id: str):
+    """
+    Push status updates over a WebSocket instead of HTTP polling.
+
+    Uses a MongoDB change stream filtered on this video's _id, so each
+    update costs zero queries. Falls back to server-side polling when the
+    deployment is not a replica set (change streams unavailable).
+    """
+    def payload(doc):
+        return {
+            "video_id": video_id,
+            "status": doc["status"],
+            "progress_percent": _PROGRESS.get(doc["status"], 0),
+            "stage": _STAGE.get(doc["status"], "unknown"),
+            "error": doc.get("error_message")
+        }
+
+    await websocket.accept()
+    collection = get_videos_collection()
+
+    video = await collection.find_one({"_id": video_id}, {"status": 1, "error_message": 1})
+    if not video:
+        await websocket.send_json({"error": "Video not found"})
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    terminal = {VideoStatus.COMPLETED, VideoStatus.ERROR}
+
+    try:
+        await websocket.send_json(payload(video))
+        if video["status"] in terminal:
+            await websocket.close()
+            return
+
+        try:
+            # Change-stream push — zero polling queries
+            async with collection.watch(
+                [{"$match": {"documentKey._id": video_id}}],
+                full_document="updateLookup"
+            ) as stream:
+                async for change in stream:
+                    doc = change.get("fullDocument")
+                    if not doc:
+                        continue
+                    await websocket.send_json(payload(doc))
+                    if doc["status"] in terminal:
+                        break
+        except PyMongoError:
+            # Standalone Mongo (no replica set) — poll server-side instead
+            while True:
+                await asyncio.sleep(2)
+                video = await collection.find_one(
+                    {"_id": video_id}, {"status": 1, "error_message": 1}
+                )
+                if not video:
+                    break
+                await websocket.send_json(payload(video))
+                if video["status"] in terminal:
+                    break
+
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
 
 
 @router.post("/{video_id}/analyze", response_model=dict)
-async def analyze_video(video_id: str, background_tasks: BackgroundTasks):
+async def analyze_video(video_id: str, request: Request, background_tasks: BackgroundTasks):
     """
     Trigger video analysis (transcript, visual analysis, headline, location).
 
@@ -157,8 +269,8 @@ async def analyze_video(video_id: str, background_tasks: BackgroundTasks):
             detail=f"Video must be in 'uploaded' status. Current status: {video['status']}"
         )
 
-    # Trigger analysis in background
-    background_tasks.add_task(analyze_video_task, video_id)
+    # Trigger analysis in background (queue when available)
+    await _dispatch_task(request, background_tasks, "analyze_video", analyze_video_task, video_id)
 
     return {
         "video_id": video_id,
@@ -218,7 +330,7 @@ async def get_ai_metadata(video_id: str):
 
 
 @router.post("/{video_id}/regenerate-ai-metadata", response_model=dict)
-async def regenerate_ai_metadata(video_id: str, background_tasks: BackgroundTasks):
+async def regenerate_ai_metadata(video_id: str, request: Request, background_tasks: BackgroundTasks):
     """
     Regenerate AI suggestions for headline and location.
     This re-runs the AI analysis to generate fresh suggestions.
@@ -247,8 +359,9 @@ async def regenerate_ai_metadata(video_id: str, background_tasks: BackgroundTask
             detail="Video must be analyzed first. Call /analyze endpoint."
         )
 
-    # Trigger regeneration in background
-    background_tasks.add_task(regenerate_ai_suggestions_task, video_id)
+    # Trigger regeneration in background (queue when available)
+    await _dispatch_task(request, background_tasks, "regenerate_ai_suggestions",
+                         regenerate_ai_suggestions_task, video_id)
 
     return {
         "video_id": video_id,
@@ -270,16 +383,9 @@ async def update_metadata(video_id: str, request: MetadataUpdateRequest):
         Updated metadata
     """
     collection = get_videos_collection()
-    video = await collection.find_one({"_id": video_id})
-
-    if not video:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Video not found"
-        )
 
     # Build update dict
-    update_data = {"updated_at": datetime.utcnow()}
+    update_data = {"updated_at": datetime.now(timezone.utc)}
 
     if request.headline is not None:
         update_data["user_headline"] = request.headline
@@ -290,14 +396,18 @@ async def update_metadata(video_id: str, request: MetadataUpdateRequest):
     if request.show_location is not None:
         update_data["show_location"] = request.show_location
 
-    # Update database
-    await collection.update_one(
+    # Single round-trip: update and fetch the new document together
+    updated_video = await collection.find_one_and_update(
         {"_id": video_id},
-        {"$set": update_data}
+        {"$set": update_data},
+        return_document=ReturnDocument.AFTER
     )
 
-    # Get updated video
-    updated_video = await collection.find_one({"_id": video_id})
+    if not updated_video:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Video not found"
+        )
 
     # Determine final headline and location
     final_headline = updated_video.get("user_headline") or \
@@ -315,7 +425,8 @@ async def update_metadata(video_id: str, request: MetadataUpdateRequest):
 
 
 @router.post("/{video_id}/render", response_model=RenderResponse)
-async def render_video(video_id: str, request: RenderRequest, background_tasks: BackgroundTasks):
+async def render_video(video_id: str, request: RenderRequest, http_request: Request,
+                       background_tasks: BackgroundTasks):
     """
     Trigger video rendering with overlays.
 
@@ -328,22 +439,9 @@ async def render_video(video_id: str, request: RenderRequest, background_tasks:
         Render status
     """
     collection = get_videos_collection()
-    video = await collection.find_one({"_id": video_id})
-
-    if not video:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Video not found"
-        )
-
-    if video["status"] not in [VideoStatus.ANALYZED, VideoStatus.COMPLETED]:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Video must be analyzed before rendering"
-        )
 
     # Apply overrides if provided
-    update_data = {"status": VideoStatus.RENDERING, "updated_at": datetime.utcnow()}
+    update_data = {"status": VideoStatus.RENDERING, "updated_at": datetime.now(timezone.utc)}
 
     if request.headline:
         update_data["user_headline"] = request.headline
@@ -354,13 +452,29 @@ async def render_video(video_id: str, request: RenderRequest, background_tasks:
     update_data["show_location"] = request.show_location
     update_data["template_id"] = request.template_id  # Store selected template
 
-    await collection.update_one(
-        {"_id": video_id},
-        {"$set": update_data}
+    # Single round-trip: the status guard lives in the filter, so invalid
+    # transitions simply match nothing
+    video = await collection.find_one_and_update(
+        {"_id": video_id, "status": {"$in": [VideoStatus.ANALYZED, VideoStatus.COMPLETED]}},
+        {"$set": update_data},
+        return_document=ReturnDocument.AFTER
     )
 
-    # Trigger rendering in background
-    background_tasks.add_task(render_video_task, video_id)
+    if not video:
+        # Distinguish missing video from wrong-state video
+        exists = await collection.find_one({"_id": video_id}, {"_id": 1})
+        if not exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Video not found"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Video must be analyzed before rendering"
+        )
+
+    # Trigger rendering in background (queue when available)
+    await _dispatch_task(http_request, background_tasks, "render_video", render_video_task, video_id)
 
     return RenderResponse(
         video_id=video_id,
@@ -381,7 +495,15 @@ async def get_video_output(video_id: str):
         VideoOutputResponse with download URL and metadata
     """
     collection = get_videos_collection()
-    video = await collection.find_one({"_id": video_id})
+    # Skip the transcript/visual_analysis blobs — we only need output fields
+    video = await collection.find_one(
+        {"_id": video_id},
+        {
+            "status": 1, "processed_path": 1, "user_headline": 1,
+            "user_location": 1, "headline.primary": 1, "location.text": 1,
+            "show_location": 1, "upload_timestamp": 1
+        }
+    )
 
     if not video:
         raise HTTPException(
@@ -442,7 +564,11 @@ async def download_video(video_id: str):
         Video file stream
     """
     collection = get_videos_collection()
-    video = await collection.find_one({"_id": video_id})
+    # Only the path is needed — don't decode the analysis blobs
+    video = await collection.find_one(
+        {"_id": video_id},
+        {"processed_path": 1}
+    )
 
     if not video:
         raise HTTPException(
@@ -460,25 +586,14 @@ async def download_video(video_id: str):
     filename = f"{video_id}_processed.mp4"
     headers = {"Content-Disposition": f"attachment; filename={filename}"}
 
-    # S3 storage — stream file through backend
+    # S3 storage — redirect to a presigned URL so clients pull straight
+    # from S3 and the API server moves ~zero bytes per download
     if processed_path.startswith("s3://"):
         try:
-            from app.services.storage_service import _get_s3_client
-            without_prefix = processed_path[5:]
-            bucket, key = without_prefix.split("/", 1)
-            s3 = _get_s3_client()
-            s3_obj = s3.get_object(Bucket=bucket, Key=key)
-            body = s3_obj["Body"]
-
-            def stream():
-                while chunk := body.read(8192):
-                    yield chunk
-
-            return StreamingResponse(
-                stream(),
-                media_type="video/mp4",
-                headers=headers
-            )
+            url = StorageService.get_download_url(processed_path, video_id)
+            if not url:
+                raise ValueError("Could not generate presigned URL")
+            return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to download from S3: {e}")
 
@@ -1,17 +1,242 @@
 """Gemini AI service for video analysis, transcript, headline, and location detection."""
 
+import asyncio
+import hashlib
+import logging
+import mmap
 import os
-import json
-import time
+import re
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from PIL import Image
 import google.genai as genai
 from google.genai import types
 
-from app.config import settings
+import orjson
+from pydantic import BaseModel
+
+from app.config import get_settings
 from app.models.video import TranscriptData, VisualAnalysis, HeadlineData, LocationData
 
+logger = logging.getLogger(__name__)
+
+
+# Optional zstd compression for analysis cache entries — transcripts are
+# 5-20 KB of text that squeezes ~4-5x, so the cache holds far more entries
+# per byte. Plain documents are stored when zstandard isn't installed.
+try:
+    import zstandard as zstd
+    _ZSTD_COMPRESSOR = zstd.ZstdCompressor(level=3)
+    _ZSTD_DECOMPRESSOR = zstd.ZstdDecompressor()
+except ImportError:
+    _ZSTD_COMPRESSOR = None
+    _ZSTD_DECOMPRESSOR = None
+
+
+class CombinedAnalysis(BaseModel):
+    """Response schema for the fused single-call analysis."""
+    transcript: TranscriptData
+    headline: HeadlineData
+    location: LocationData
+
+
+# Static prompt text built once at import — the methods only format in the
+# (pre-sliced) transcript instead of rebuilding multi-KB f-strings per call.
+_HEADLINE_PROMPT_TEMPLATE = """
+Based on this video transcript, generate a short and engaging news headline.
+
+Transcript:
+{transcript}
+
+CRITICAL LANGUAGE INSTRUCTION:
+- Detect the language of the transcript carefully
+- Generate ALL headlines in the EXACT SAME LANGUAGE as the transcript
+- If transcript is in Tamil (தமிழ்), ALL headlines MUST be in Tamil script only
+- If transcript is in Hindi (हिंदी), ALL headlines MUST be in Hindi script only
+- If transcript is in English, ALL headlines MUST be in English only
+- Do NOT translate or mix languages — use only the native script
+- Preserve the native script and writing system exactly
+
+Create a news-style headline that is:
+- 5-12 words (or equivalent in the detected language)
+- Factual and descriptive — based strictly on what the transcript says
+- Suitable for a news broadcast overlay
+- Do NOT invent content not present in the transcript
+
+Return a JSON object with this exact structure:
+{{
+    "primary": "Main news headline in the detected language",
+    "alternatives": ["Alt 1 in same language", "Alt 2 in same language"],
+    "confidence": 0.85,
+    "tone": "informative"
+}}
+"""
+
+_LOCATION_PROMPT_TEMPLATE = """
+Identify any location mentioned in this video transcript.
+
+Transcript:
+{transcript}
+
+CRITICAL LANGUAGE INSTRUCTION:
+- Detect the language of the transcript carefully
+- Return the location name in the EXACT SAME LANGUAGE as the transcript
+- If transcript is in Tamil (தமிழ்), return location in Tamil ONLY (e.g., "திருவாரூர், தமிழ்நாடு, இந்தியா")
+- If transcript is in Hindi (हिंदी), return location in Hindi ONLY (e.g., "दिल्ली, भारत")
+- If transcript is in English, return location in English ONLY (e.g., "Paris, France")
+- Do NOT mix languages - use only the native script of the detected language
+
+Return a JSON object with this exact structure:
+{{
+    "text": "City, Region, Country in the detected language" or null if no location detected,
+    "confidence": 0.85,
+    "source": "transcript"
+}}
+
+Guidelines:
+- Look for place names, landmarks, cities, regions mentioned
+- Return location in the same language and script as the transcript
+- If uncertain, set text to null and confidence low
+
+IMPORTANT: The location text MUST be in the same language as the transcript.
+"""
+
+_TRANSCRIPT_PROMPT = """
+Carefully analyze this video and extract ALL available text information:
+
+1. SPEECH: Transcribe every spoken word, dialogue, narration, announcements
+2. VISIBLE TEXT: Read all on-screen text — banners, signs, lower-thirds, subtitles,
+   captions, news tickers, title cards, location names, any written text visible in the video
+3. AUDIO CUES: Note background audio if relevant (crowd sounds, music, etc.)
+
+Write a DETAILED, COMPLETE transcript combining all of the above.
+Do NOT summarize — write out the actual words spoken and text seen.
+Include as much detail as possible. Aim for at least a few sentences.
+
+Return a JSON object with this exact structure:
+{
+    "text": "Full detailed transcript here with all speech and visible text...",
+    "language": "detected language code (e.g., 'en', 'ta', 'hi', 'te', 'ml')",
+    "language_confidence": 0.95,
+    "has_significant_audio": true
+}
+
+Language detection: use 'ta' for Tamil, 'hi' for Hindi, 'te' for Telugu,
+'ml' for Malayalam, 'en' for English. Detect from both audio and on-screen text.
+"""
+
+_COMBINED_PROMPT = """
+Analyze this video and return transcript, headline and location together.
+
+1. TRANSCRIPT: Transcribe every spoken word AND read all on-screen text
+   (banners, signs, lower-thirds, subtitles, tickers, title cards).
+   Write a DETAILED, COMPLETE transcript — do NOT summarize.
+   Detect the language ('ta' Tamil, 'hi' Hindi, 'te' Telugu,
+   'ml' Malayalam, 'en' English) from both audio and on-screen text.
+
+2. HEADLINE: A short news-style headline (5-12 words), factual and
+   based strictly on the video content, plus 2 alternatives.
+
+3. LOCATION: Any place mentioned or shown ("City, Region, Country"),
+   or null if none detected, with a confidence score and
+   source="transcript".
+
+CRITICAL: headline and location text MUST be in the EXACT SAME
+LANGUAGE and native script as the video's content — Tamil stays in
+Tamil script, Hindi in Hindi script. Do NOT translate or mix.
+"""
+
+
+# Known place names for the local fast path in detect_location_from_text.
+# Lowercased match token → formatted location. Covers the cities/districts
+# this service most commonly sees (Tamil Nadu + Indian metros) in both
+# English and Tamil script; anything else falls through to Gemini.
+_PLACES = {
+    "chennai": "Chennai, Tamil Nadu, India",
+    "coimbatore": "Coimbatore, Tamil Nadu, India",
+    "madurai": "Madurai, Tamil Nadu, India",
+    "tiruchirappalli": "Tiruchirappalli, Tamil Nadu, India",
+    "trichy": "Tiruchirappalli, Tamil Nadu, India",
+    "salem": "Salem, Tamil Nadu, India",
+    "tirunelveli": "Tirunelveli, Tamil Nadu, India",
+    "thoothukudi": "Thoothukudi, Tamil Nadu, India",
+    "vellore": "Vellore, Tamil Nadu, India",
+    "erode": "Erode, Tamil Nadu, India",
+    "thanjavur": "Thanjavur, Tamil Nadu, India",
+    "tiruvarur": "Tiruvarur, Tamil Nadu, India",
+    "kanyakumari": "Kanyakumari, Tamil Nadu, India",
+    "puducherry": "Puducherry, India",
+    "bengaluru": "Bengaluru, Karnataka, India",
+    "bangalore": "Bengaluru, Karnataka, India",
+    "hyderabad": "Hyderabad, Telangana, India",
+    "mumbai": "Mumbai, Maharashtra, India",
+    "delhi": "Delhi, India",
+    "kolkata": "Kolkata, West Bengal, India",
+    "kochi": "Kochi, Kerala, India",
+    "thiruvananthapuram": "Thiruvananthapuram, Kerala, India",
+    "சென்னை": "சென்னை, தமிழ்நாடு, இந்தியா",
+    "கோயம்புத்தூர்": "கோயம்புத்தூர், தமிழ்நாடு, இந்தியா",
+    "மதுரை": "மதுரை, தமிழ்நாடு, இந்தியா",
+    "திருச்சி": "திருச்சி, தமிழ்நாடு, இந்தியா",
+    "சேலம்": "சேலம், தமிழ்நாடு, இந்தியா",
+    "திருநெல்வேலி": "திருநெல்வேலி, தமிழ்நாடு, இந்தியா",
+    "தஞ்சாவூர்": "தஞ்சாவூர், தமிழ்நாடு, இந்தியா",
+    "திருவாரூர்": "திருவாரூர், தமிழ்நாடு, இந்தியா",
+    "கன்னியாகுமரி": "கன்னியாகுமரி, தமிழ்நாடு, இந்தியா",
+    "புதுச்சேரி": "புதுச்சேரி, இந்தியா",
+    "பெங்களூரு": "பெங்களூரு, கர்நாடகா, இந்தியா",
+    "மும்பை": "மும்பை, மகாராஷ்டிரா, இந்தியா",
+    "டெல்லி": "டெல்லி, இந்தியா",
+}
+
+# Longest-first alternation so "tiruchirappalli" wins over "trichy"-style
+# prefixes; compiled once at import (a DFA pass is ~ns/KB vs a ~1 s API call).
+# Latin names carry word boundaries so substrings inside ordinary words
+# ("erode" in "eroded", "salem" in "Jerusalem") don't match; Tamil names
+# stay plain alternates since \b is ASCII-oriented and unreliable there.
+_PLACE_RE = re.compile(
+    "|".join(
+        rf"\b{re.escape(name)}\b" if name.isascii() else re.escape(name)
+        for name in sorted(_PLACES, key=len, reverse=True)
+    ),
+    re.IGNORECASE
+)
+
+# Signals that a transcript could plausibly contain a proper noun at all:
+# a capitalized Latin word, a run of uppercase (all-caps transcripts),
+# or any Indic-script text (where casing doesn't exist, so only Gemini
+# can judge)
+_PROPER_NOUN_HINT_RE = re.compile(r"[A-Z][a-z]|[A-Z]{2,}|[ऀ-ൿ]")
+
+
+# Shared genai client — one TLS handshake and one HTTP/2 connection pool
+# for the whole process, no matter how many GeminiService instances the
+# workers construct. Created lazily so importing this module doesn't
+# require GEMINI_API_KEY.
+_CLIENT: Optional[genai.Client] = None
+
+
+def _get_client() -> genai.Client:
+    """Get (or lazily create) the process-wide genai client."""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = genai.Client(api_key=get_settings().GEMINI_API_KEY)
+    return _CLIENT
+
+
+def _analysis_cache_collection():
+    """
+    Analysis dedup cache, keyed by video content hash.
+    Returns None when the service runs outside the server (no DB connected).
+    """
+    try:
+        from app.database import Database
+        if Database.db is None:
+            return None
+        return Database.db["analysis_cache"]
+    except Exception:
+        return None
+
 
 class GeminiService:
     """Service for interacting with Google Gemini API."""
@@ -24,10 +249,22 @@ class GeminiService:
     ]
 
     def __init__(self):
-        """Initialize Gemini service with API key."""
-        self.client = genai.Client(api_key=settings.GEMINI_API_KEY)
+        """Initialize Gemini service with the shared client."""
+        self.client = _get_client()
         self.model_name = self.MODEL_PRIORITY[0]
 
+    async def warmup(self):
+        """
+        Pre-warm the shared client's connection pool with a trivial call so
+        the first real analysis doesn't pay TLS + HTTP/2 setup (~200-500 ms).
+        Registered as a fire-and-forget task at server startup.
+        """
+        try:
+            await self.client.aio.models.get(model=self.model_name)
+            logger.info("Gemini connection warmed up")
+        except Exception as e:
+            logger.warning("Gemini warmup failed: %s", e)
+
     async def analyze_video_complete(
         self,
         video_path: str
@@ -42,14 +279,37 @@ class GeminiService:
         Returns:
             Tuple of (transcript, visual_analysis, headline, location)
         """
-        print(f"Starting complete analysis: {video_path}")
+        logger.info("Starting complete analysis: %s", video_path)
+
+        # Dedup: identical bytes (re-uploads of the same video) skip the
+        # whole Gemini pipeline via a content-hash cache lookup
+        content_hash = await asyncio.to_thread(self._content_hash, video_path)
+        cached = await self._get_cached_analysis(content_hash)
+        if cached is not None:
+            logger.info("Analysis cache hit: %s", content_hash[:12])
+            return cached
 
         # Upload video to Gemini
         video_file = await self._upload_video_to_gemini(video_path)
 
-        # Extract transcript (includes speech + visible text)
-        transcript = await self.extract_transcript(video_file)
-        print(f"Transcript extracted: {len(transcript.text)} chars")
+        # Fused single-call analysis: transcript, headline and location in
+        # one round-trip. Falls back to the per-field calls if it fails.
+        try:
+            transcript, headline, location = await self._analyze_all(video_file)
+        except Exception as e:
+            logger.warning("Fused analysis failed (%s), falling back to per-field calls", e)
+            transcript = await self.extract_transcript(video_file)
+            headline, location = await asyncio.gather(
+                self.generate_headline_from_text(transcript.text),
+                self.detect_location_from_text(transcript.text)
+            )
+
+        logger.info("Transcript extracted: %d chars", len(transcript.text))
+        logger.info("Headline generated: %s", headline.primary)
+        if location.text:
+            logger.info("Location detected: %s", location.text)
+        else:
+            logger.info("No location detected")
 
         # Simple visual check (optional - just for metadata)
         visual = VisualAnalysis(
@@ -61,19 +321,138 @@ class GeminiService:
             description="Video content"
         )
 
-        # Generate headline FROM TRANSCRIPT ONLY (no video re-upload)
-        headline = await self.generate_headline_from_text(transcript.text)
-        print(f"Headline generated: {headline.primary}")
-
-        # Detect location FROM TRANSCRIPT ONLY
-        location = await self.detect_location_from_text(transcript.text)
-        if location.text:
-            print(f"Location detected: {location.text}")
-        else:
-            print("No location detected")
+        await self._store_cached_analysis(
+            content_hash, transcript, visual, headline, location
+        )
 
         return transcript, visual, headline, location
 
+    async def analyze_many(
+        self,
+        video_paths: List[str],
+        max_concurrent: int = 8
+    ) -> List[Tuple[TranscriptData, VisualAnalysis, HeadlineData, LocationData]]:
+        """
+        Analyze several videos concurrently with a bounded semaphore.
+        The work is network-bound, so k videos in flight scale near-linearly
+        up to Gemini quota; the shared client multiplexes the uploads.
+
+        Args:
+            video_paths: Paths to video files
+            max_concurrent: Max analyses in flight at once
+
+        Returns:
+            Analysis tuples in the same order as video_paths
+        """
+        sem = asyncio.Semaphore(max_concurrent)
+
+        async def _one(path: str):
+            async with sem:
+                return await self.analyze_video_complete(path)
+
+        return await asyncio.gather(*(_one(p) for p in video_paths))
+
+    @staticmethod
+    def _content_hash(video_path: str) -> str:
+        """
+        SHA-256 of the file bytes, read through mmap in 1 MB chunks so the
+        kernel page cache feeds the hash without a second userspace copy.
+        """
+        h = hashlib.sha256()
+        with open(video_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return h.hexdigest()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                for offset in range(0, size, 1024 * 1024):
+                    h.update(view[offset:offset + 1024 * 1024])
+        return h.hexdigest()
+
+    async def _get_cached_analysis(
+        self, content_hash: str
+    ) -> Optional[Tuple[TranscriptData, VisualAnalysis, HeadlineData, LocationData]]:
+        """Look up a previous analysis of identical video bytes."""
+        cache = _analysis_cache_collection()
+        if cache is None:
+            return None
+        try:
+            entry = await cache.find_one({"_id": content_hash})
+            if not entry:
+                return None
+            if "payload" in entry:
+                if _ZSTD_DECOMPRESSOR is None:
+                    return None  # compressed entry but zstandard missing
+                record = orjson.loads(_ZSTD_DECOMPRESSOR.decompress(entry["payload"]))
+            else:
+                record = entry  # uncompressed legacy/fallback document
+            return (
+                TranscriptData(**record["transcript"]),
+                VisualAnalysis(**record["visual"]),
+                HeadlineData(**record["headline"]),
+                LocationData(**record["location"])
+            )
+        except Exception as e:
+            logger.warning("Analysis cache read failed: %s", e)
+            return None
+
+    async def _store_cached_analysis(self, content_hash, transcript, visual,
+                                     headline, location):
+        """Persist an analysis result keyed by content hash (best effort)."""
+        cache = _analysis_cache_collection()
+        if cache is None:
+            return
+        try:
+            record = {
+                "transcript": transcript.model_dump(),
+                "visual": visual.model_dump(),
+                "headline": headline.model_dump(),
+                "location": location.model_dump(),
+            }
+            if _ZSTD_COMPRESSOR is not None:
+                doc = {"payload": _ZSTD_COMPRESSOR.compress(orjson.dumps(record))}
+            else:
+                doc = record
+            doc["created_at"] = datetime.now(timezone.utc)
+            await cache.replace_one({"_id": content_hash}, doc, upsert=True)
+        except Exception as e:
+            logger.warning("Analysis cache write failed: %s", e)
+
+    async def _analyze_all(
+        self,
+        video_file
+    ) -> Tuple[TranscriptData, HeadlineData, LocationData]:
+        """
+        Extract transcript, headline and location in ONE Gemini call.
+        Saves two model round-trips per video vs the per-field methods.
+
+        Args:
+            video_file: Gemini uploaded video file
+
+        Returns:
+            Tuple of (transcript, headline, location)
+        """
+        response = await self._generate_with_retry(
+            contents=[
+                types.Part.from_uri(file_uri=video_file.uri, mime_type=video_file.mime_type),
+                types.Part.from_text(text=_COMBINED_PROMPT)
+            ],
+            temperature=0.2,
+            response_schema=CombinedAnalysis,
+            max_tokens=4096
+        )
+
+        response_text = response.text
+        if not response_text or response_text.isspace():
+            raise ValueError("Empty response from Gemini")
+
+        # Parse + validate in one pass in pydantic-core; a malformed
+        # response raises here and the caller falls back to per-field calls
+        combined = CombinedAnalysis.model_validate_json(response_text)
+        if not combined.headline.primary.strip():
+            combined.headline.primary = combined.transcript.text.strip()[:80] or "செய்தி வீடியோ"
+        return combined.transcript, combined.headline, combined.location
+
     async def _upload_video_to_gemini(self, video_path: str):
         """
         Upload video file to Gemini API using new google.genai package.
@@ -84,9 +463,8 @@ class GeminiService:
         Returns:
             Uploaded file object
         """
-        print(f"Uploading video to Gemini...")
-        print(f"File path: {video_path}")
-        print(f"File size: {Path(video_path).stat().st_size / (1024*1024):.2f} MB")
+        logger.info("Uploading video to Gemini: %s (%.2f MB)",
+                    video_path, Path(video_path).stat().st_size / (1024*1024))
 
         try:
             # Detect MIME type from file extension
@@ -95,63 +473,87 @@ class GeminiService:
             if not mime_type:
                 mime_type = 'video/mp4'  # Default to mp4
 
-            print(f"MIME type: {mime_type}")
-
-            # Upload file using new API
-            with open(video_path, 'rb') as f:
-                uploaded_file = self.client.files.upload(file=f, config={'mime_type': mime_type})
+            logger.debug("MIME type: %s", mime_type)
+
+            # Upload file using new API. The SDK call is synchronous and
+            # takes seconds for large videos, so run it in a worker thread
+            # instead of stalling the event loop. Passing the path (not an
+            # open handle) lets the SDK stream chunks straight from the
+            # page cache, so a 200 MB video never lands in Python memory
+            # as one bytes buffer.
+            uploaded_file = await asyncio.to_thread(
+                self.client.files.upload,
+                file=video_path,
+                config={'mime_type': mime_type}
+            )
 
-            print(f"Uploaded file: {uploaded_file.name}")
-            print(f"File URI: {uploaded_file.uri}")
+            logger.info("Uploaded file: %s (%s)", uploaded_file.name, uploaded_file.uri)
 
-            # Wait for processing if needed
+            # Wait for processing if needed. Exponential backoff starting at
+            # 250 ms (capped at 2 s) so short videos that finish processing
+            # quickly aren't stuck waiting out a fixed 5 s interval.
             max_wait = 120
-            wait_time = 0
+            wait_time = 0.0
+            delay = 0.25
             while uploaded_file.state == "PROCESSING":
                 if wait_time >= max_wait:
                     raise TimeoutError(f"Video processing timeout")
 
-                print(f"Waiting for processing... ({wait_time}s)")
-                time.sleep(5)
-                wait_time += 5
-                uploaded_file = self.client.files.get(name=uploaded_file.name)
+                logger.debug("Waiting for processing... (%.1fs)", wait_time)
+                await asyncio.sleep(delay)
+                wait_time += delay
+                delay = min(delay * 1.5, 2.0)
+                uploaded_file = await asyncio.to_thread(
+                    self.client.files.get, name=uploaded_file.name
+                )
 
             if uploaded_file.state == "FAILED":
                 raise Exception(f"Video processing failed")
 
-            print(f"Video ready (state: {uploaded_file.state})")
+            logger.info("Video ready (state: %s)", uploaded_file.state)
             return uploaded_file
 
         except Exception as e:
-            print(f"ERROR: {type(e).__name__}: {e}")
+            logger.error("Upload failed: %s: %s", type(e).__name__, e)
             raise
 
-    def _generate_with_retry(self, prompt, contents=None, temperature=0.3):
+    async def _generate_with_retry(self, prompt=None, contents=None, temperature=0.3,
+                                   response_schema=None, max_tokens=None):
         """
         Call Gemini with automatic model fallback on 503 / quota errors.
-        Tries each model in MODEL_PRIORITY before giving up.
+        Tries each model in MODEL_PRIORITY before giving up. Fully async:
+        uses the SDK's aio client and non-blocking backoff, so concurrent
+        calls (gather / analyze_many) overlap instead of serializing.
+
+        Pass either `prompt` (text-only calls) or `contents` (multimodal);
+        `prompt` is ignored when `contents` is given.
         """
         last_error = None
-        for model in self.MODEL_PRIORITY:
+        for attempt, model in enumerate(self.MODEL_PRIORITY):
             try:
                 call_contents = contents if contents is not None else prompt
-                response = self.client.models.generate_content(
+                response = await self.client.aio.models.generate_content(
                     model=model,
                     contents=call_contents,
                     config=types.GenerateContentConfig(
                         temperature=temperature,
-                        response_mime_type="application/json"
+                        response_mime_type="application/json",
+                        response_schema=response_schema,
+                        # Decoder wall time scales with generated tokens, so
+                        # cap output per call type instead of letting the
+                        # model run open-ended
+                        max_output_tokens=max_tokens
                     )
                 )
                 if model != self.model_name:
-                    print(f"   ⚠️ Used fallback model: {model}")
+                    logger.warning("Used fallback model: %s", model)
                 return response
             except Exception as e:
                 err_str = str(e)
                 if '503' in err_str or 'UNAVAILABLE' in err_str or '429' in err_str or 'quota' in err_str.lower():
-                    print(f"   Model {model} unavailable ({e}), trying next...")
+                    logger.warning("Model %s unavailable (%s), trying next...", model, e)
                     last_error = e
-                    time.sleep(2)
+                    await asyncio.sleep(min(2 ** attempt * 0.5, 4.0))
                     continue
                 raise  # Non-retryable error — re-raise immediately
         raise last_error
@@ -167,61 +569,28 @@ class GeminiService:
             TranscriptData with combined transcript
         """
         try:
-            prompt = """
-            Carefully analyze this video and extract ALL available text information:
-
-            1. SPEECH: Transcribe every spoken word, dialogue, narration, announcements
-            2. VISIBLE TEXT: Read all on-screen text — banners, signs, lower-thirds, subtitles,
-               captions, news tickers, title cards, location names, any written text visible in the video
-            3. AUDIO CUES: Note background audio if relevant (crowd sounds, music, etc.)
-
-            Write a DETAILED, COMPLETE transcript combining all of the above.
-            Do NOT summarize — write out the actual words spoken and text seen.
-            Include as much detail as possible. Aim for at least a few sentences.
-
-            Return a JSON object with this exact structure:
-            {
-                "text": "Full detailed transcript here with all speech and visible text...",
-                "language": "detected language code (e.g., 'en', 'ta', 'hi', 'te', 'ml')",
-                "language_confidence": 0.95,
-                "has_significant_audio": true
-            }
-
-            Language detection: use 'ta' for Tamil, 'hi' for Hindi, 'te' for Telugu,
-            'ml' for Malayalam, 'en' for English. Detect from both audio and on-screen text.
-            """
-
-            response = self._generate_with_retry(
-                prompt=prompt,
+            response = await self._generate_with_retry(
                 contents=[
                     types.Part.from_uri(file_uri=video_file.uri, mime_type=video_file.mime_type),
-                    types.Part.from_text(text=prompt)
+                    types.Part.from_text(text=_TRANSCRIPT_PROMPT)
                 ],
-                temperature=0.2
+                temperature=0.2,
+                max_tokens=4096
             )
 
-            response_text = response.text.strip()
+            response_text = response.text
 
-            if not response_text:
-                print(f"WARNING: Empty response")
+            if not response_text or response_text.isspace():
+                logger.warning("Empty response")
                 raise ValueError("Empty response from Gemini")
 
-            print(f"Transcript response: {len(response_text)} chars")
+            logger.info("Transcript response: %d chars", len(response_text))
 
-            result = json.loads(response_text)
-            transcript_text = result.get("text", "")
-
-            return TranscriptData(
-                text=transcript_text,
-                language=result.get("language", "en"),
-                language_confidence=result.get("language_confidence", 0.0),
-                has_significant_audio=result.get("has_significant_audio", True)
-            )
+            return TranscriptData.model_validate_json(response_text)
 
         except Exception as e:
-            import traceback
-            print(f"❌ Error extracting transcript: {type(e).__name__}: {e}")
-            print(traceback.format_exc())
+            logger.error("Error extracting transcript: %s: %s", type(e).__name__, e,
+                         exc_info=True)
             return TranscriptData(
                 text="",
                 language="unknown",
@@ -250,53 +619,21 @@ class GeminiService:
                     tone="neutral"
                 )
 
-            prompt = f"""
-            Based on this video transcript, generate a short and engaging news headline.
-
-            Transcript:
-            {transcript[:2000]}
-
-            CRITICAL LANGUAGE INSTRUCTION:
-            - Detect the language of the transcript carefully
-            - Generate ALL headlines in the EXACT SAME LANGUAGE as the transcript
-            - If transcript is in Tamil (தமிழ்), ALL headlines MUST be in Tamil script only
-            - If transcript is in Hindi (हिंदी), ALL headlines MUST be in Hindi script only
-            - If transcript is in English, ALL headlines MUST be in English only
-            - Do NOT translate or mix languages — use only the native script
-            - Preserve the native script and writing system exactly
-
-            Create a news-style headline that is:
-            - 5-12 words (or equivalent in the detected language)
-            - Factual and descriptive — based strictly on what the transcript says
-            - Suitable for a news broadcast overlay
-            - Do NOT invent content not present in the transcript
-
-            Return a JSON object with this exact structure:
-            {{
-                "primary": "Main news headline in the detected language",
-                "alternatives": ["Alt 1 in same language", "Alt 2 in same language"],
-                "confidence": 0.85,
-                "tone": "informative"
-            }}
-            """
-
-            response = self._generate_with_retry(prompt=prompt, temperature=0.4)
-            result = json.loads(response.text.strip())
-
-            primary = result.get("primary", "").strip()
-            if not primary:
-                # Use first 80 chars of transcript as last resort
-                primary = transcript.strip()[:80]
+            prompt = _HEADLINE_PROMPT_TEMPLATE.format(transcript=transcript[:2000])
 
-            return HeadlineData(
-                primary=primary,
-                alternatives=result.get("alternatives", []),
-                confidence=result.get("confidence", 0.5),
-                tone=result.get("tone", "informative")
+            response = await self._generate_with_retry(
+                prompt=prompt, temperature=0.4, max_tokens=128
             )
+            headline = HeadlineData.model_validate_json(response.text)
+
+            if not headline.primary.strip():
+                # Use first 80 chars of transcript as last resort
+                headline.primary = transcript.strip()[:80]
+
+            return headline
 
         except Exception as e:
-            print(f"Error generating headline: {e}")
+            logger.error("Error generating headline: %s", e)
             # Use transcript itself as fallback instead of generic text
             fallback = transcript.strip()[:80] if transcript and transcript.strip() else "செய்தி வீடியோ"
             return HeadlineData(
@@ -327,47 +664,36 @@ class GeminiService:
                     coordinates=None
                 )
 
-            prompt = f"""
-            Identify any location mentioned in this video transcript.
-
-            Transcript:
-            {transcript[:1000]}
-
-            CRITICAL LANGUAGE INSTRUCTION:
-            - Detect the language of the transcript carefully
-            - Return the location name in the EXACT SAME LANGUAGE as the transcript
-            - If transcript is in Tamil (தமிழ்), return location in Tamil ONLY (e.g., "திருவாரூர், தமிழ்நாடு, இந்தியா")
-            - If transcript is in Hindi (हिंदी), return location in Hindi ONLY (e.g., "दिल्ली, भारत")
-            - If transcript is in English, return location in English ONLY (e.g., "Paris, France")
-            - Do NOT mix languages - use only the native script of the detected language
-
-            Return a JSON object with this exact structure:
-            {{
-                "text": "City, Region, Country in the detected language" or null if no location detected,
-                "confidence": 0.85,
-                "source": "transcript"
-            }}
-
-            Guidelines:
-            - Look for place names, landmarks, cities, regions mentioned
-            - Return location in the same language and script as the transcript
-            - If uncertain, set text to null and confidence low
+            # Local fast path: a known place name in the transcript skips
+            # the Gemini round-trip entirely
+            match = _PLACE_RE.search(transcript[:1000])
+            if match:
+                return LocationData(
+                    text=_PLACES[match.group(0).lower()],
+                    confidence=0.9,
+                    source="transcript",
+                    coordinates=None
+                )
 
-            IMPORTANT: The location text MUST be in the same language as the transcript.
-            """
+            # Definite miss: nothing that could even be a proper noun
+            # (no capitalized Latin word, no Indic-script text)
+            if not _PROPER_NOUN_HINT_RE.search(transcript[:1000]):
+                return LocationData(
+                    text=None,
+                    confidence=0.0,
+                    source="none",
+                    coordinates=None
+                )
 
-            response = self._generate_with_retry(prompt=prompt, temperature=0.3)
-            result = json.loads(response.text.strip())
+            prompt = _LOCATION_PROMPT_TEMPLATE.format(transcript=transcript[:1000])
 
-            return LocationData(
-                text=result.get("text"),
-                confidence=result.get("confidence", 0.0),
-                source=result.get("source", "transcript"),
-                coordinates=None
+            response = await self._generate_with_retry(
+                prompt=prompt, temperature=0.3, max_tokens=96
             )
+            return LocationData.model_validate_json(response.text)
 
         except Exception as e:
-            print(f"Error detecting location: {e}")
+            logger.error("Error detecting location: %s", e)
             return LocationData(
                 text=None,
                 confidence=0.0,
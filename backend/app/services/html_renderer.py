@@ -1,18 +1,311 @@
 """HTML Template Renderer Service using html2image."""
 
 from pathlib import Path
-from typing import Optional, Dict
-from datetime import datetime
+from typing import Dict, Optional, Tuple
+from datetime import date
+from functools import lru_cache
+import atexit
+import hashlib
+import queue
+import shutil
+import re
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import logging
 import os
 import base64
 
+from PIL import Image
+
+try:
+    from html2image import Html2Image
+except ImportError:
+    Html2Image = None
+
+logger = logging.getLogger(__name__)
+
+
+# Each Html2Image launches a headless Chromium (~200 ms+ fork/exec + V8
+# init), so instances are cached per viewport size and reused for every
+# render instead of being rebuilt per call.
+_HTI_INSTANCES: Dict[Tuple[int, int], "Html2Image"] = {}
+_HTI_LOCK = threading.Lock()
+
+_CHROME_FLAGS = [
+    '--font-render-hinting=none',
+    '--disable-font-subpixel-positioning',
+    '--force-device-scale-factor=1',
+    '--hide-scrollbars',
+    '--allow-file-access-from-files',  # Allow loading local fonts
+    '--disable-web-security'  # Allow cross-origin font loading
+]
+
+
+# One compiled pattern for all per-render placeholders — a single linear
+# scan of the HTML instead of one full str.replace pass per placeholder
+_PLACEHOLDER_RE = re.compile(r'\{\{(headline|location|date|show_location)\}\}')
+
+# filename → (mtime, data URI). Fonts and logos are hundreds of KB each;
+# re-reading + re-base64-encoding them for every render wasted disk I/O
+# and ~1 ms CPU per asset, so the encoded URI is kept for the process.
+_ASSET_CACHE: Dict[str, Tuple[float, str]] = {}
+
+# directory → (dir mtime, matching paths). Asset directories are static
+# between deploys; caching the listing (busted when the directory mtime
+# changes) saves the opendir/readdir storm of re-globbing every render.
+_ASSETS_SCAN: Dict[str, Tuple[float, list]] = {}
+
+
+def _list_assets(directory: Path, patterns: Tuple[str, ...]) -> list:
+    """Files in directory matching the glob patterns, cached by dir mtime."""
+    key = f"{directory}|{'|'.join(patterns)}"
+    try:
+        mtime = directory.stat().st_mtime
+    except OSError:
+        return []
+    cached = _ASSETS_SCAN.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    paths = [p for pattern in patterns for p in sorted(directory.glob(pattern))]
+    _ASSETS_SCAN[key] = (mtime, paths)
+    return paths
+
+
+def _get_data_uri(path: Path, mime: str) -> str:
+    """Base64 data URI for an asset file, cached by mtime."""
+    key = str(path)
+    mtime = path.stat().st_mtime
+    cached = _ASSET_CACHE.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    b64 = base64.b64encode(path.read_bytes()).decode('ascii')
+    data_uri = f'data:{mime};base64,{b64}'
+    _ASSET_CACHE[key] = (mtime, data_uri)
+    return data_uri
+
+
+@lru_cache(maxsize=32)
+def _load_template(path_str: str, mtime: float) -> str:
+    """
+    Read a template file, cached by (path, mtime) — templates are static
+    between deploys, so repeat renders skip the open/read syscalls while
+    an edited file (new mtime) still busts the cache.
+    """
+    return Path(path_str).read_text(encoding='utf-8')
+
+
+def _embed_assets(html_content: str, templates_dir: Path) -> str:
+    """Replace relative font/image references with base64 data URIs."""
+    # Embed fonts as base64 data URIs so Chrome headless can load them
+    # (the URIs come from the process-wide asset cache)
+    fonts_dir = templates_dir.parent / 'assets' / 'fonts'
+    font_map: Dict[str, str] = {}
+    for font_file in _list_assets(fonts_dir, ('*.ttf',)):
+        try:
+            font_map[font_file.name] = _get_data_uri(font_file, 'font/truetype')
+        except Exception as e:
+            logger.warning("could not embed font %s: %s", font_file.name, e)
+    if font_map:
+        # One linear sub pass over the HTML instead of a full
+        # str.replace scan per font file
+        pattern = re.compile(
+            r"url\('\.\./assets/fonts/("
+            + '|'.join(map(re.escape, font_map)) + r")'\)"
+        )
+        html_content = pattern.sub(
+            lambda m: f"url('{font_map[m.group(1)]}')", html_content
+        )
+
+    # Also embed logo as base64, batched the same way
+    assets_dir = templates_dir.parent / 'assets'
+    image_map: Dict[str, str] = {}
+    for img_file in _list_assets(assets_dir, ('*.png', '*.jpg', '*.jpeg')):
+        try:
+            mime = 'image/png' if img_file.suffix == '.png' else 'image/jpeg'
+            image_map[img_file.name] = _get_data_uri(img_file, mime)
+        except Exception:
+            pass
+    if image_map:
+        pattern = re.compile(
+            r'\.\./assets/(' + '|'.join(map(re.escape, image_map)) + r')'
+        )
+        html_content = pattern.sub(
+            lambda m: image_map[m.group(1)], html_content
+        )
+
+    return html_content
+
+
+@lru_cache(maxsize=32)
+def _prepare_template(path_str: str, mtime: float) -> str:
+    """
+    Template text with all asset substitutions already applied — the
+    embedded fonts/logo don't depend on per-render data, so only the
+    {{placeholder}} injection is left for the hot path.
+    """
+    return _embed_assets(_load_template(path_str, mtime), Path(path_str).parent)
+
+
+# Content-addressed PNG cache: identical (template, size, data) renders
+# produce byte-identical output, so a cache hit hardlinks the existing
+# file and skips Chromium entirely
+_RENDER_CACHE_DIR = Path(tempfile.gettempdir()) / 'html_renderer_cache'
+
+# Intermediate PNGs (4-8MB each) go to tmpfs when available so the
+# render loop never touches the block layer; only the final move hits
+# the destination filesystem.
+_SHM_RENDER_DIR: Optional[Path] = None
+_SHM_CHECKED = False
+
+
+def _get_shm_dir() -> Optional[Path]:
+    """Per-process /dev/shm scratch dir, or None when tmpfs is unusable."""
+    global _SHM_RENDER_DIR, _SHM_CHECKED
+    if _SHM_CHECKED:
+        return _SHM_RENDER_DIR
+    _SHM_CHECKED = True
+    if os.name == 'posix' and os.access('/dev/shm', os.W_OK):
+        shm_dir = Path('/dev/shm') / f'html_render_{os.getpid()}'
+        try:
+            shm_dir.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            return None
+        atexit.register(shutil.rmtree, str(shm_dir), True)
+        _SHM_RENDER_DIR = shm_dir
+    return _SHM_RENDER_DIR
+
+
+def _render_cache_key(template_name: str, template_mtime: float, width: int,
+                      height: int, mapping: Dict[str, str],
+                      render_scale: float = 1.0) -> str:
+    """
+    Stable 128-bit key over everything that affects the output PNG.
+    The template mtime is part of the key: the cache directory outlives
+    the process, so without it an edited template would keep serving
+    PNGs rendered from the old markup.
+    """
+    raw = repr((template_name, template_mtime, width, height, render_scale,
+                sorted(mapping.items())))
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hardlink (free) with a copy fallback for cross-device paths."""
+    if os.path.exists(dst):
+        os.unlink(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+# (date ordinal, formatted string) — strftime with its locale lookup is
+# ~10µs, which adds up across batch renders that all share today's date
+_DATE_CACHE: list = [None, None]
+
+
+def _today_str() -> str:
+    """Today formatted as e.g. '31 August 2026', recomputed once per day."""
+    today = date.today()
+    ordinal = today.toordinal()
+    if _DATE_CACHE[0] != ordinal:
+        _DATE_CACHE[:] = [ordinal, today.strftime("%d %B %Y")]
+    return _DATE_CACHE[1]
+
+
+def _build_mapping(data: Dict[str, str]) -> Dict[str, str]:
+    """Per-render placeholder values for a template data dict."""
+    return {
+        'headline': str(data.get('headline', 'Breaking News')),
+        'location': str(data.get('location', '')),
+        'date': _today_str(),
+        'show_location': 'block' if data.get('show_location', True) else 'none'
+    }
+
+
+@lru_cache(maxsize=32)
+def _compiled_template(path_str: str, mtime: float):
+    """
+    Compile a prepared template into a closure. The template is split on
+    placeholder boundaries once; each render is then just a join of the
+    static chunks with the dynamic values — no scanning at all.
+    """
+    parts = _PLACEHOLDER_RE.split(_prepare_template(path_str, mtime))
+
+    def render(mapping: Dict[str, str]) -> str:
+        # Odd indices are placeholder names, even indices static chunks
+        return ''.join(
+            mapping[part] if i & 1 else part
+            for i, part in enumerate(parts)
+        )
+
+    return render
+
+
+def _get_hti(width: int, height: int, output_dir: str) -> "Html2Image":
+    """Get (or lazily launch) the shared Html2Image for this viewport."""
+    with _HTI_LOCK:
+        hti = _HTI_INSTANCES.get((width, height))
+        if hti is None:
+            hti = Html2Image(
+                output_path=output_dir,
+                size=(width, height),
+                custom_flags=list(_CHROME_FLAGS)
+            )
+            _HTI_INSTANCES[(width, height)] = hti
+        else:
+            # Reuse the warm browser; only the save location changes
+            hti.output_path = output_dir
+        return hti
+
+
+def _shutdown_hti():
+    """Close the cached browsers at interpreter exit."""
+    with _HTI_LOCK:
+        for hti in _HTI_INSTANCES.values():
+            close = getattr(hti, 'close', None)
+            if close is not None:
+                try:
+                    close()
+                except Exception:
+                    pass
+        _HTI_INSTANCES.clear()
+
+
+atexit.register(_shutdown_hti)
+
 
 class HTMLRenderer:
     """Render HTML templates to images for video overlays."""
 
-    def __init__(self):
+    def __init__(self, dedicated: bool = False):
+        """
+        Args:
+            dedicated: Own a private Chromium per viewport instead of the
+                module-shared one (used by HTMLRendererPool so workers can
+                paint in parallel)
+        """
         self.templates_dir = Path(__file__).parent.parent.parent / 'templates'
+        self._own_hti: Optional[Dict[Tuple[int, int], "Html2Image"]] = (
+            {} if dedicated else None
+        )
+
+    def _acquire_hti(self, width: int, height: int, output_dir: str) -> "Html2Image":
+        """Shared browser by default, private one for pool workers."""
+        if self._own_hti is None:
+            return _get_hti(width, height, output_dir)
+        hti = self._own_hti.get((width, height))
+        if hti is None:
+            hti = Html2Image(
+                output_path=output_dir,
+                size=(width, height),
+                custom_flags=list(_CHROME_FLAGS)
+            )
+            self._own_hti[(width, height)] = hti
+        else:
+            hti.output_path = output_dir
+        return hti
 
     def render_template_to_image(
         self,
@@ -20,10 +313,12 @@ class HTMLRenderer:
         output_path: str,
         data: Dict[str, str],
         width: int = 1080,
-        height: int = 1920
+        height: int = 1920,
+        render_scale: float = 1.0,
+        output_format: str = 'png'
     ) -> bool:
         """
-        Render HTML template to PNG image.
+        Render HTML template to an image.
 
         Args:
             template_name: Name of template file (e.g., 'template1.html')
@@ -31,58 +326,152 @@ class HTMLRenderer:
             data: Template data (headline, location, date, etc.)
             width: Output image width
             height: Output image height
+            render_scale: Paint at this fraction of the viewport and
+                upscale with Lanczos — Chrome paint cost scales with
+                pixels, so 0.5 paints 4x fewer. 1.0 renders natively.
+            output_format: 'png' (default, lossless with alpha), or
+                'jpeg'/'webp' for opaque overlays — much cheaper to encode
+                than PNG's DEFLATE and ~10x smaller on disk
 
         Returns:
             True if successful
         """
         try:
-            from html2image import Html2Image
+            if Html2Image is None:
+                logger.error("html2image not installed; install with: pip install html2image")
+                return False
 
             # Load template file
             template_path = self.templates_dir / template_name
             if not template_path.exists():
-                print(f"❌ Template not found: {template_path}")
+                logger.error("template not found: %s", template_path)
                 return False
 
-            # Read template HTML
-            with open(template_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
+            # Compiled template (assets pre-embedded, split once on
+            # placeholders) rendered with this call's data
+            mapping = _build_mapping(data)
+            template_mtime = template_path.stat().st_mtime
+            render_fn = _compiled_template(str(template_path), template_mtime)
 
-            # Replace placeholders with actual data
-            html_content = self._inject_data(html_content, data)
+            # Identical headline/location/date/template → identical PNG;
+            # serve those from the content-addressed cache
+            fmt = output_format.lower()
+            cache_key = _render_cache_key(template_name, template_mtime, width,
+                                          height, mapping, render_scale)
+            cached_png = _RENDER_CACHE_DIR / f"{cache_key}.{fmt}"
+            if cached_png.exists():
+                _link_or_copy(str(cached_png), output_path)
+                logger.debug("reused cached render for %s", Path(output_path).name)
+                return True
 
-            # Initialize html2image with font rendering support
-            hti = Html2Image(
-                output_path=str(Path(output_path).parent),
-                size=(width, height),
-                custom_flags=[
-                    '--font-render-hinting=none',
-                    '--disable-font-subpixel-positioning',
-                    '--force-device-scale-factor=1',
-                    '--hide-scrollbars',
-                    '--allow-file-access-from-files',  # Allow loading local fonts
-                    '--disable-web-security'  # Allow cross-origin font loading
-                ]
-            )
+            html_content = render_fn(mapping)
 
-            # Render HTML to image
+            # Paint into tmpfs when available; only the finished file is
+            # moved onto the (possibly slow) destination filesystem
+            shm_dir = _get_shm_dir()
+            work_dir = shm_dir if shm_dir is not None else Path(output_path).parent
             output_file = Path(output_path).name
+            work_path = str(work_dir / output_file)
+
+            # Reuse a warm browser (shared, or this renderer's own)
+            hti = self._acquire_hti(width, height, str(work_dir))
+
+            # Render HTML to image (optionally at a reduced viewport)
+            render_size = (
+                (int(width * render_scale), int(height * render_scale))
+                if render_scale != 1.0 else (width, height)
+            )
             hti.screenshot(
                 html_str=html_content,
                 save_as=output_file,
-                size=(width, height)
+                size=render_size
             )
 
-            print(f"✅ Rendered template to: {output_file}")
+            # Post-process in one Pillow pass: upscale and/or transcode
+            # (html2image itself always writes PNG)
+            if render_scale != 1.0 or fmt != 'png':
+                with Image.open(work_path) as img:
+                    if render_scale != 1.0:
+                        img = img.resize((width, height), Image.LANCZOS)
+                    if fmt == 'png':
+                        img.save(work_path, optimize=True)
+                    elif fmt == 'webp':
+                        img.convert('RGB').save(work_path, format='WEBP',
+                                                quality=92, method=4)
+                    else:
+                        img.convert('RGB').save(work_path, format='JPEG',
+                                                quality=92)
+
+            if work_path != output_path:
+                shutil.move(work_path, output_path)
+
+            # Populate the cache for future identical renders (best effort)
+            try:
+                _RENDER_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                if not cached_png.exists():
+                    os.link(output_path, cached_png)
+            except OSError:
+                pass
+
+            logger.info("rendered template %s", output_file)
             return True
 
-        except ImportError:
-            print("❌ html2image not installed. Install with: pip install html2image")
+        except Exception:
+            logger.error("HTML rendering failed", exc_info=True)
             return False
-        except Exception as e:
-            print(f"❌ HTML rendering failed: {e}")
-            import traceback
-            traceback.print_exc()
+
+    def render_templates_to_images(
+        self,
+        jobs: list,
+        width: int = 1080,
+        height: int = 1920
+    ) -> bool:
+        """
+        Render several templates in one browser session.
+
+        One hti.screenshot call with list inputs renders every job in a
+        single Chromium session — N renders cost launch + N×(nav+paint)
+        instead of N×(launch+nav+paint).
+
+        Args:
+            jobs: List of (template_name, output_path, data) tuples
+            width: Output image width
+            height: Output image height
+
+        Returns:
+            True if all jobs rendered
+        """
+        try:
+            if Html2Image is None:
+                logger.error("html2image not installed; install with: pip install html2image")
+                return False
+
+            # Build all HTML strings first, grouped by output directory
+            # (one screenshot call per directory — usually just one)
+            by_dir: Dict[str, Tuple[list, list]] = {}
+            for template_name, output_path, data in jobs:
+                template_path = self.templates_dir / template_name
+                if not template_path.exists():
+                    logger.error("template not found: %s", template_path)
+                    return False
+                render_fn = _compiled_template(
+                    str(template_path), template_path.stat().st_mtime
+                )
+                html_content = render_fn(_build_mapping(data))
+                parent = str(Path(output_path).parent)
+                htmls, names = by_dir.setdefault(parent, ([], []))
+                htmls.append(html_content)
+                names.append(Path(output_path).name)
+
+            for parent, (htmls, names) in by_dir.items():
+                hti = self._acquire_hti(width, height, parent)
+                hti.screenshot(html_str=htmls, save_as=names, size=(width, height))
+                logger.info("rendered %d templates to %s", len(names), parent)
+
+            return True
+
+        except Exception:
+            logger.error("batch HTML rendering failed", exc_info=True)
             return False
 
     def _inject_data(self, html_content: str, data: Dict[str, str]) -> str:
@@ -95,49 +484,55 @@ class HTMLRenderer:
             {{date}} - Current date
             {{video_placeholder}} - Video area marker
         """
-        # Get current date
-        current_date = datetime.now().strftime("%d %B %Y")
-
-        # Replace all placeholders
-        replacements = {
-            '{{headline}}': data.get('headline', 'Breaking News'),
-            '{{location}}': data.get('location', ''),
-            '{{date}}': current_date,
-            '{{show_location}}': 'block' if data.get('show_location', True) else 'none'
-        }
-
-        for placeholder, value in replacements.items():
-            html_content = html_content.replace(placeholder, str(value))
-
-        # Embed fonts as base64 data URIs so Chrome headless can load them
-        fonts_dir = self.templates_dir.parent / 'assets' / 'fonts'
-        for font_file in fonts_dir.glob('*.ttf'):
-            relative_url = f"url('../assets/fonts/{font_file.name}')"
+        # Single regex pass; the render paths use the compiled-template
+        # closure instead, this stays for ad-hoc HTML strings
+        mapping = _build_mapping(data)
+        return _PLACEHOLDER_RE.sub(lambda m: mapping[m.group(1)], html_content)
+
+
+class HTMLRendererPool:
+    """
+    Pool of renderers, each owning its own persistent Chromium, for
+    rendering independent overlays in parallel. A single browser paints
+    serially; K workers give near-K× throughput on multi-core hosts.
+    """
+
+    def __init__(self, workers: int = None):
+        if workers is None:
+            workers = max(2, (os.cpu_count() or 2) // 2)
+        self.workers = workers
+        self._renderers: "queue.Queue[HTMLRenderer]" = queue.Queue()
+        for _ in range(workers):
+            self._renderers.put(HTMLRenderer(dedicated=True))
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    def render_many(
+        self,
+        jobs: list,
+        width: int = 1080,
+        height: int = 1920
+    ) -> list:
+        """
+        Render (template_name, output_path, data) jobs across the pool.
+
+        Returns:
+            Per-job success flags, in job order
+        """
+        def _run(job):
+            template_name, output_path, data = job
+            renderer = self._renderers.get()
             try:
-                font_data = font_file.read_bytes()
-                b64 = base64.b64encode(font_data).decode('ascii')
-                data_uri = f"url('data:font/truetype;base64,{b64}')"
-                html_content = html_content.replace(relative_url, data_uri)
-                print(f"   ✓ Embedded font: {font_file.name}")
-            except Exception as e:
-                print(f"   ⚠️ Could not embed font {font_file.name}: {e}")
-
-        # Also embed logo as base64
-        assets_dir = self.templates_dir.parent / 'assets'
-        for img_ext in ['png', 'jpg', 'jpeg']:
-            for img_file in assets_dir.glob(f'*.{img_ext}'):
-                relative_src = f'../assets/{img_file.name}'
-                try:
-                    img_data = img_file.read_bytes()
-                    b64 = base64.b64encode(img_data).decode('ascii')
-                    mime = 'image/png' if img_ext == 'png' else 'image/jpeg'
-                    data_uri = f'data:{mime};base64,{b64}'
-                    html_content = html_content.replace(relative_src, data_uri)
-                    print(f"   ✓ Embedded image: {img_file.name}")
-                except Exception:
-                    pass
+                return renderer.render_template_to_image(
+                    template_name, output_path, data, width, height
+                )
+            finally:
+                self._renderers.put(renderer)
 
-        return html_content
+        return list(self._executor.map(_run, jobs))
+
+    def shutdown(self):
+        """Stop the worker threads (browsers close at process exit)."""
+        self._executor.shutdown(wait=True)
 
 
 # Synchronous wrapper (html2image is already synchronous, but keeping for compatibility)
@@ -157,3 +552,13 @@ class HTMLRendererSync:
         return renderer.render_template_to_image(
             template_name, output_path, data, width, height
         )
+
+    @staticmethod
+    def render_templates(
+        jobs: list,
+        width: int = 1080,
+        height: int = 1920
+    ) -> bool:
+        """Render a batch of templates in one browser session."""
+        renderer = HTMLRenderer()
+        return renderer.render_templates_to_images(jobs, width, height)
@@ -1,9 +1,147 @@
 """Perplexity AI service for headline refinement (optional)."""
 
-from typing import List, Optional
-from openai import OpenAI
+import asyncio
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from typing import List, Optional, Tuple
+
+from cachetools import TTLCache
+from openai import AsyncOpenAI
+
+from app.config import get_settings
+
+
+# Retries and reprocessing refine the same headline/context repeatedly;
+# hits here cost nothing instead of a full LLM round-trip. Day-long TTL
+# since refinements aren't time-sensitive within a run.
+_REFINE_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=86400)
+_COMPARE_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=86400)
+_CACHE_LOCK = threading.Lock()
+
+# First integer in the model's reply — tolerates trailing "." or prose
+_DIGIT_RE = re.compile(r'\s*(\d+)')
+
+
+# Optional persistent layer under the in-memory caches so worker
+# processes and CLI runs reuse each other's results across restarts
+try:
+    from diskcache import Cache as DiskCache
+    _LLM_DISK_CACHE = DiskCache(
+        os.path.join(tempfile.gettempdir(), 'video_template_llm_cache'),
+        size_limit=1 << 30
+    )
+except Exception:
+    _LLM_DISK_CACHE = None
+
+_DISK_TTL = 7 * 24 * 3600
+
+# Trim context at token boundaries so prompts hit a known token budget
+# instead of a byte count that can cut mid-word (or mid-multibyte for
+# Tamil text). cl100k_base is the closest encoding for the Sonar models.
+try:
+    import tiktoken
+    _ENC = tiktoken.get_encoding('cl100k_base')
+except Exception:
+    _ENC = None
+
+
+def _truncate_tokens(text: str, n: int) -> str:
+    """Trim text to at most n tokens (roughly 4*n chars without tiktoken)."""
+    if _ENC is None:
+        return text[:n * 4]
+    ids = _ENC.encode(text)
+    if len(ids) <= n:
+        return text
+    return _ENC.decode(ids[:n])
+
+
+# Prompt bodies are fixed; format() only splices the dynamic fields
+# instead of rebuilding ~1KB of f-string text on every call.
+_REFINE_PROMPT = """
+            You are an expert social media content creator specializing in viral video headlines.
+
+            Original headline: {headline}
+            {alternatives_text}
+
+            Video context: {ctx}
+
+            Task: Refine or improve this headline to maximize engagement on platforms like TikTok, Instagram Reels, and YouTube Shorts.
 
-from app.config import settings
+            Requirements:
+            - 5-10 words maximum
+            - Click-worthy and attention-grabbing
+            - Authentic and not clickbait
+            - Match the video's actual content
+            - Use emotional triggers when appropriate
+
+            Return ONLY the refined headline, nothing else.
+            """
+
+_ALTERNATIVES_PROMPT = """
+            Generate {count} engaging headlines for a video based on this context:
+
+            {ctx}
+
+            Requirements:
+            - 5-10 words each
+            - Diverse in tone and style
+            - Optimized for social media engagement
+            - No numbering or bullets
+
+            Return only the headlines, one per line.
+            """
+
+_COMPARE_PROMPT = """
+            Compare these headlines for a video and select the BEST one for maximum engagement:
+
+            {headlines_list}
+
+            Video context: {ctx}
+
+            Evaluate based on:
+            - Engagement potential
+            - Authenticity
+            - Relevance to content
+            - Emotional impact
+            - Social media optimization
+
+            Return ONLY the number of the best headline (1, 2, 3, etc.), nothing else.
+            """
+
+
+def _cache_key(*parts: str) -> str:
+    """Stable 128-bit key over the request-defining strings."""
+    return hashlib.blake2b('|'.join(parts).encode(), digest_size=16).hexdigest()
+
+
+def _cache_get(mem_cache: TTLCache, key: str):
+    """Memory first, then the shared disk cache (promoting hits)."""
+    with _CACHE_LOCK:
+        value = mem_cache.get(key)
+    if value is not None or _LLM_DISK_CACHE is None:
+        return value
+    try:
+        value = _LLM_DISK_CACHE.get(key)
+    except Exception:
+        return None
+    if value is not None:
+        with _CACHE_LOCK:
+            mem_cache[key] = value
+    return value
+
+
+def _cache_set(mem_cache: TTLCache, key: str, value) -> None:
+    """Store in memory and (best effort) on disk."""
+    with _CACHE_LOCK:
+        mem_cache[key] = value
+    if _LLM_DISK_CACHE is not None:
+        try:
+            _LLM_DISK_CACHE.set(key, value, expire=_DISK_TTL)
+        except Exception:
+            pass
 
 
 class PerplexityService:
@@ -11,12 +149,13 @@ class PerplexityService:
 
     def __init__(self):
         """Initialize Perplexity service with API key."""
+        settings = get_settings()
         if not settings.PERPLEXITY_API_KEY:
             print("⚠️  Perplexity API key not configured (optional)")
             self.client = None
             return
 
-        self.client = OpenAI(
+        self.client = AsyncOpenAI(
             api_key=settings.PERPLEXITY_API_KEY,
             base_url="https://api.perplexity.ai"
         )
@@ -46,34 +185,26 @@ class PerplexityService:
             print("⚠️  Perplexity not available, returning original headline")
             return headline
 
+        ctx = _truncate_tokens(context, 120)
+        cache_key = _cache_key(headline, ctx)
+        cached = _cache_get(_REFINE_CACHE, cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            # Build prompt
             alternatives_text = ""
             if alternatives:
                 alternatives_text = "\n".join([f"- {alt}" for alt in alternatives])
                 alternatives_text = f"\n\nAlternative headlines:\n{alternatives_text}"
 
-            prompt = f"""
-            You are an expert social media content creator specializing in viral video headlines.
-
-            Original headline: {headline}
-            {alternatives_text}
-
-            Video context: {context[:300]}
-
-            Task: Refine or improve this headline to maximize engagement on platforms like TikTok, Instagram Reels, and YouTube Shorts.
-
-            Requirements:
-            - 5-10 words maximum
-            - Click-worthy and attention-grabbing
-            - Authentic and not clickbait
-            - Match the video's actual content
-            - Use emotional triggers when appropriate
-
-            Return ONLY the refined headline, nothing else.
-            """
+            prompt = _REFINE_PROMPT.format(
+                headline=headline, alternatives_text=alternatives_text, ctx=ctx
+            )
 
-            response = self.client.chat.completions.create(
+            # Stream the completion — the answer is a single line, so we
+            # can close the HTTP response as soon as a newline arrives
+            # instead of waiting out the full generation
+            stream = await self.client.chat.completions.create(
                 model="llama-3.1-sonar-small-128k-online",
                 messages=[
                     {
@@ -86,15 +217,23 @@ class PerplexityService:
                     }
                 ],
                 temperature=0.7,
-                max_tokens=50
+                max_tokens=50,
+                stream=True
             )
 
-            refined = response.choices[0].message.content.strip()
+            parts = []
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content or ''
+                parts.append(delta)
+                if '\n' in delta:
+                    await stream.close()
+                    break
 
-            # Remove quotes if present
-            refined = refined.strip('"\'')
+            # Remove surrounding whitespace/quotes
+            refined = ''.join(parts).strip().strip('"\'')
 
             print(f"✨ Perplexity refined headline: {refined}")
+            _cache_set(_REFINE_CACHE, cache_key, refined)
             return refined
 
         except Exception as e:
@@ -120,21 +259,11 @@ class PerplexityService:
             return []
 
         try:
-            prompt = f"""
-            Generate {count} engaging headlines for a video based on this context:
-
-            {context[:400]}
-
-            Requirements:
-            - 5-10 words each
-            - Diverse in tone and style
-            - Optimized for social media engagement
-            - No numbering or bullets
-
-            Return only the headlines, one per line.
-            """
+            prompt = _ALTERNATIVES_PROMPT.format(
+                count=count, ctx=_truncate_tokens(context, 160)
+            )
 
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="llama-3.1-sonar-small-128k-online",
                 messages=[
                     {
@@ -159,6 +288,32 @@ class PerplexityService:
             print(f"❌ Error generating alternatives with Perplexity: {e}")
             return []
 
+    async def refine_and_alternatives(
+        self,
+        headline: str,
+        context: str,
+        alternatives: List[str] = None,
+        count: int = 3
+    ) -> Tuple[str, List[str]]:
+        """
+        Refine the headline and generate alternatives concurrently.
+        The two calls are independent, so gather overlaps their round-trips.
+
+        Args:
+            headline: Original headline
+            context: Video context
+            alternatives: Alternatives to consider while refining
+            count: Number of new alternatives to generate
+
+        Returns:
+            Tuple of (refined headline, alternative headlines)
+        """
+        refined, generated = await asyncio.gather(
+            self.refine_headline(headline, context, alternatives),
+            self.generate_alternative_headlines(context, count)
+        )
+        return refined, generated
+
     async def compare_headlines(
         self,
         headlines: List[str],
@@ -177,27 +332,19 @@ class PerplexityService:
         if not self.is_available() or not headlines:
             return headlines[0] if headlines else "Untitled"
 
+        ctx = _truncate_tokens(context, 120)
+        cache_key = _cache_key(*sorted(headlines), ctx)
+        cached = _cache_get(_COMPARE_CACHE, cache_key)
+        if cached is not None:
+            return cached
+
         try:
             headlines_list = "\n".join([f"{i+1}. {h}" for i, h in enumerate(headlines)])
 
-            prompt = f"""
-            Compare these headlines for a video and select the BEST one for maximum engagement:
-
-            {headlines_list}
-
-            Video context: {context[:300]}
-
-            Evaluate based on:
-            - Engagement potential
-            - Authenticity
-            - Relevance to content
-            - Emotional impact
-            - Social media optimization
-
-            Return ONLY the number of the best headline (1, 2, 3, etc.), nothing else.
-            """
+            prompt = _COMPARE_PROMPT.format(headlines_list=headlines_list, ctx=ctx)
 
-            response = self.client.chat.completions.create(
+            # Stream and stop at the first newline — only a number is needed
+            stream = await self.client.chat.completions.create(
                 model="llama-3.1-sonar-small-128k-online",
                 messages=[
                     {
@@ -210,20 +357,30 @@ class PerplexityService:
                     }
                 ],
                 temperature=0.3,
-                max_tokens=10
+                max_tokens=10,
+                stream=True
             )
 
-            # Get the selected number
-            selection = response.choices[0].message.content.strip()
-            try:
-                index = int(selection) - 1
+            parts = []
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content or ''
+                parts.append(delta)
+                if '\n' in delta:
+                    await stream.close()
+                    break
+
+            # Get the selected number — the model sometimes answers
+            # "2." or "Number 2", which int() would reject outright
+            selection = ''.join(parts).strip()
+            best = headlines[0]  # Fallback to first headline
+            m = _DIGIT_RE.match(selection)
+            if m:
+                index = int(m.group(1)) - 1
                 if 0 <= index < len(headlines):
-                    return headlines[index]
-            except ValueError:
-                pass
+                    best = headlines[index]
 
-            # Fallback to first headline
-            return headlines[0]
+            _cache_set(_COMPARE_CACHE, cache_key, best)
+            return best
 
         except Exception as e:
             print(f"❌ Error comparing headlines with Perplexity: {e}")
@@ -3,68 +3,391 @@
 from pathlib import Path
 from typing import Optional, Dict
 from datetime import datetime
+from functools import lru_cache
+import hashlib
+import logging
+import re
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image, ImageDraw, ImageFont
 import os
 
+# Pillow 10 moved the resampling filters to Image.Resampling; pillow-simd
+# (a drop-in accelerated build, pinned to Pillow 9.x) still exposes them
+# on Image directly. This works with either install.
+RESAMPLE_LANCZOS = getattr(Image, "Resampling", Image).LANCZOS
+
+logger = logging.getLogger(__name__)
+
+# Tamil Unicode block — a compiled character class scans in C instead of
+# a per-character Python comparison loop
+_TAMIL_RE = re.compile(r'[\u0B80-\u0BFF]')
+
+# 'template4' / 'template4.html' \u2192 '4' in one compiled match
+_TPL_RE = re.compile(r'template(\d+)(?:\.html)?$')
+
+
+# Overlays are a pure function of their inputs plus today's date, so a
+# content-addressed PNG cache turns repeated renders (retries, the same
+# news item across videos) into a hardlink instead of a full repaint and
+# re-encode. Shared tempdir location mirrors the LLM disk cache.
+_OVERLAY_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'video_template_overlay_cache')
+
+
+def _overlay_cache_path(key_parts: tuple) -> str:
+    """Cache file path for a render defined by key_parts."""
+    digest = hashlib.blake2b(repr(key_parts).encode(), digest_size=16).hexdigest()
+    return os.path.join(_OVERLAY_CACHE_DIR, digest + '.png')
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hardlink src to dst, falling back to a copy across filesystems."""
+    if os.path.exists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+
+@lru_cache(maxsize=8)
+def _resolve_font_path(is_tamil: bool, bold: bool) -> Optional[str]:
+    """First existing font file for a script/weight, resolved once."""
+    fonts_dir = SimpleOverlayRenderer.FONTS_DIR
+
+    if is_tamil:
+        # Tamil script — use project-bundled NotoSansTamil (always present)
+        candidates = [
+            str(fonts_dir / ("NotoSansTamil-Bold.ttf" if bold else "NotoSansTamil-Regular.ttf")),
+            str(fonts_dir / "NotoSansTamil-Regular.ttf"),
+            str(fonts_dir / "NotoSansTamil-Bold.ttf"),
+            # Windows fallback
+            "C:/Windows/Fonts/Nirmala.ttc",
+        ]
+    else:
+        # Latin / English
+        candidates = [
+            # Windows paths
+            "C:/Windows/Fonts/arialbd.ttf" if bold else "C:/Windows/Fonts/arial.ttf",
+            "C:/Windows/Fonts/arial.ttf",
+            "C:/Windows/Fonts/arialbd.ttf",
+            "C:/Windows/Fonts/Nirmala.ttc",
+            # Linux paths (Debian/Ubuntu — available on Render)
+            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+            "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+            "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+            "/usr/share/fonts/truetype/freefont/FreeSansBold.ttf" if bold else "/usr/share/fonts/truetype/freefont/FreeSans.ttf",
+            "/usr/share/fonts/truetype/freefont/FreeSans.ttf",
+            # NotoSans as last resort (covers Latin too)
+            str(fonts_dir / "NotoSansTamil-Bold.ttf"),
+            str(fonts_dir / "NotoSansTamil-Regular.ttf"),
+        ]
+
+    for font_path in candidates:
+        if os.path.exists(font_path):
+            return font_path
+    return None
+
+
+@lru_cache(maxsize=64)
+def _get_font(path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Parsed FreeType face per (path, size) — TTF parsing is not free."""
+    return ImageFont.truetype(path, size)
+
+
+@lru_cache(maxsize=32)
+def _today_str(fmt: str, minute_bucket: int) -> str:
+    """
+    Formatted date, recomputed at most once a minute per format —
+    strftime with its locale lookup is identical for every frame of a
+    batch, so batch renders share one call.
+    """
+    return datetime.now().strftime(fmt)
+
+
+@lru_cache(maxsize=8)
+def _circle_mask(diameter: int) -> Image.Image:
+    """
+    Reusable filled-circle mask. Rasterized once per diameter and then
+    pasted, instead of re-running the ellipse scanline fill per render.
+    """
+    mask = Image.new('L', (diameter, diameter), 0)
+    ImageDraw.Draw(mask).ellipse([0, 0, diameter, diameter], fill=255)
+    return mask
+
+
+@lru_cache(maxsize=1)
+def _logo_sprite() -> Optional[Image.Image]:
+    """
+    The Tiruvarur logo as a finished 135x135 sprite — opened, converted,
+    LANCZOS-resized, circle-masked and ringed in white exactly once.
+    Chrome rebuilds at other canvas sizes composite the sprite instead
+    of redoing the file read, resize and mask.
+    """
+    logo_path = Path(__file__).parent.parent.parent / 'assets' / 'tiruvarur_logo.png'
+    if not logo_path.exists():
+        return None
+    try:
+        logo = Image.open(logo_path).convert('RGBA').resize((130, 130), RESAMPLE_LANCZOS)
+    except Exception as e:
+        logger.warning("Logo error: %s", e)
+        return None
+    logo.putalpha(_circle_mask(130))
+    sprite = Image.new('RGBA', (135, 135), (0, 0, 0, 0))
+    sprite.paste(logo, (2, 2), logo)
+    ImageDraw.Draw(sprite).ellipse([0, 0, 134, 134],
+                                   outline=(255, 255, 255, 255), width=4)
+    return sprite
+
+
+@lru_cache(maxsize=128)
+def _render_text_tile(text: str, font_path: str, size: int,
+                      fill: tuple, max_w: int) -> Image.Image:
+    """
+    Wrapped text rendered once into a tight RGBA tile. Re-rendering the
+    same headline for many frames re-shapes the identical string through
+    FreeType every call; pasting the cached tile skips all of it.
+    """
+    font = _get_font(font_path, size)
+    wrapped = SimpleOverlayRenderer._wrap_text(text, font, max_w)
+    probe = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+    bbox = probe.multiline_textbbox((0, 0), wrapped, font=font, align='center')
+    tile = Image.new('RGBA', (max(bbox[2] - bbox[0], 1), max(bbox[3] - bbox[1], 1)),
+                     (0, 0, 0, 0))
+    ImageDraw.Draw(tile).multiline_text((-bbox[0], -bbox[1]), wrapped,
+                                        fill=fill, font=font, align='center')
+    return tile
+
+
+def _paste_headline(img: Image.Image, draw: "ImageDraw.ImageDraw",
+                    headline: str, size: int, bold: bool, fill: tuple,
+                    max_w: int, center: tuple) -> None:
+    """Paste the cached headline tile centered at `center` (cx, cy)."""
+    font_path = _resolve_font_path(
+        SimpleOverlayRenderer._has_tamil(headline), bold
+    )
+    if font_path is None:
+        # No resolvable font — fall back to direct drawing with the
+        # default bitmap font
+        font = SimpleOverlayRenderer._load_font(size, bold=bold, text=headline)
+        wrapped = SimpleOverlayRenderer._wrap_text(headline, font, max_w)
+        draw.multiline_text(center, wrapped, fill=fill, font=font,
+                            anchor="mm", align="center")
+        return
+    tile = _render_text_tile(headline, font_path, size, fill, max_w)
+    img.paste(tile, (center[0] - tile.width // 2, center[1] - tile.height // 2),
+              tile)
+
+
+def _paste_date(img: Image.Image, draw: "ImageDraw.ImageDraw", fmt: str,
+                size: int, bold: bool, fill: tuple, pos: tuple,
+                anchor: str = "la", text: Optional[str] = None) -> None:
+    """
+    Paste today's date from a cached glyph tile. The string changes once
+    a day but is drawn on every frame; a manual dict beats lru_cache
+    here since the key space is tiny and stale days must be replaced,
+    not kept. The tile records the textbbox offset for its anchor so the
+    paste lands pixel-for-pixel where draw.text would put it.
+    """
+    today = text if text is not None else _today_str(fmt, int(time.time() // 60))
+    font_path = _resolve_font_path(False, bold)
+    if font_path is None:
+        font = SimpleOverlayRenderer._load_font(size, bold=bold, text="")
+        draw.text(pos, today, fill=fill, font=font, anchor=anchor)
+        return
+    key = (fmt, size, bold, fill, anchor)
+    entry = SimpleOverlayRenderer._DATE_TILE_CACHE.get(key)
+    if entry is None or entry[0] != today:
+        font = _get_font(font_path, size)
+        probe = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+        bbox = probe.textbbox((0, 0), today, font=font, anchor=anchor)
+        tile = Image.new('RGBA', (max(bbox[2] - bbox[0], 1),
+                                  max(bbox[3] - bbox[1], 1)), (0, 0, 0, 0))
+        ImageDraw.Draw(tile).text((-bbox[0], -bbox[1]), today, fill=fill,
+                                  font=font, anchor=anchor)
+        entry = (today, tile, (bbox[0], bbox[1]))
+        SimpleOverlayRenderer._DATE_TILE_CACHE[key] = entry
+    _, tile, (ox, oy) = entry
+    img.paste(tile, (pos[0] + ox, pos[1] + oy), tile)
+
+
+def _solid_fill(img: Image.Image, box, color) -> None:
+    """
+    Solid rectangle via Image.paste — a straight C fill that skips the
+    ImageDraw dispatch. The +1 keeps ImageDraw's inclusive box semantics
+    so chrome pixels land exactly where the rectangle calls put them.
+    """
+    x0, y0, x1, y1 = box
+    img.paste(color, (x0, y0, min(x1 + 1, img.width), min(y1 + 1, img.height)))
+
+
+@lru_cache(maxsize=16)
+def _template_chrome(template_num: str, width: int, height: int,
+                     has_location: bool) -> Image.Image:
+    """
+    Static "chrome" for a template — every fill, bar, badge and pill
+    that does not depend on the headline/location/date. Built once per
+    (template, size, location-visibility) and reused; callers must
+    .copy() the returned image before drawing dynamic content on it.
+    """
+    img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+
+    if template_num == '1':
+        gold_color = (255, 215, 0, 230)
+        # Golden gradient top bar (approximation)
+        _solid_fill(img, (0, 0, width, 280), gold_color)
+
+        # Logo box (top right)
+        font_logo = SimpleOverlayRenderer._load_font(32, bold=True, text="")
+        logo_x, logo_y = width - 230, 40
+        draw.rectangle([logo_x, logo_y, logo_x+180, logo_y+70],
+                      fill=(255, 255, 255, 255), outline=gold_color, width=3)
+        draw.text((logo_x+90, logo_y+35), "NEWS", fill=gold_color,
+                 font=font_logo, anchor="mm")
+
+        # Headline box (bottom) with golden left border
+        headline_y = height - 450
+        draw.rectangle([60, headline_y, width-60, headline_y+180],
+                      fill=(255, 255, 255, 242))
+        draw.rectangle([60, headline_y, 70, headline_y+180], fill=gold_color)
+
+        # Location pill background
+        if has_location:
+            loc_y = height - 180
+            loc_bg = (255, 215, 0, 242)
+            # One rasterization pass instead of two ellipses + rectangle
+            draw.rounded_rectangle([60, loc_y, width-60, loc_y+50],
+                                   radius=25, fill=loc_bg)
+
+    elif template_num == '2':
+        orange_color = (255, 107, 53, 240)
+        # Orange top bar
+        _solid_fill(img, (0, 0, width, 180), orange_color)
+
+        # Logo text
+        font_logo = SimpleOverlayRenderer._load_font(48, bold=True, text="")
+        draw.text((80, 50), "NEWS BROADCAST", fill=(255, 255, 255, 255),
+                 font=font_logo)
+
+        # LIVE indicator
+        font_live = SimpleOverlayRenderer._load_font(32, bold=True, text="")
+        draw.ellipse([width-180, 35, width-80, 75], fill=(255, 0, 0, 255))
+        draw.text((width-130, 55), "● LIVE", fill=(255, 255, 255, 255),
+                 font=font_live, anchor="mm")
+
+        # Headline box (below video area)
+        headline_y = height - 520
+        draw.rectangle([80, headline_y, width-80, headline_y+170],
+                      fill=(255, 107, 53, 242))
+
+        # Bottom bar with orange top border
+        _solid_fill(img, (0, height-154, width, height-150), orange_color)
+        _solid_fill(img, (0, height-150, width, height), (45, 45, 45, 240))
+
+    elif template_num == '3':
+        # Top line
+        draw.rectangle([0, 0, width, 6], fill=(0, 0, 0, 255))
+
+        # Date badge background (top right)
+        date_x, date_y = width - 220, 40
+        draw.rectangle([date_x, date_y, date_x+180, date_y+50],
+                      fill=(0, 0, 0, 217))
+
+        # Headline box with black left border
+        headline_y = height - 520
+        draw.rectangle([60, headline_y, width-60, headline_y+190],
+                      fill=(255, 255, 255, 242))
+        draw.rectangle([60, headline_y, 68, headline_y+190], fill=(0, 0, 0, 255))
+
+        # Location pill background
+        if has_location:
+            loc_y = height - 240
+            loc_bg = (0, 0, 0, 217)
+            draw.rounded_rectangle([60, loc_y, width-60, loc_y+50],
+                                   radius=25, fill=loc_bg)
+
+        # Bottom accent
+        draw.rectangle([60, height-40, 260, height-36], fill=(0, 0, 0, 255))
+
+    elif template_num == '4':
+        # Colors from new HTML design
+        border_color = (122, 32, 13, 255)  # #7a200d
+        header_bottom_border = (92, 26, 26, 255)  # #5c1a1a
+
+        # Border frame (sides and bottom only)
+        border_width = 20
+        _solid_fill(img, (0, 0, border_width, height), border_color)
+        _solid_fill(img, (width-border_width, 0, width, height), border_color)
+        _solid_fill(img, (0, height-border_width, width, height), border_color)
+
+        # Red header block at top with its bottom border
+        header_height = 300
+        _solid_fill(img, (border_width, 0, width-border_width, header_height),
+                    border_color)
+        _solid_fill(img, (border_width, header_height-4, width-border_width,
+                    header_height), header_bottom_border)
+
+        # Logo (top right, below header) — mask and white ring are
+        # baked into the cached sprite
+        logo = _logo_sprite()
+        if logo is not None:
+            logo_x = width - 40 - 130  # 40px from right
+            logo_y = header_height + 30  # 30px below header
+            img.alpha_composite(logo, (logo_x-2, logo_y-2))
+
+        # Date box background (bottom right) with red left accent
+        date_y = height - 100
+        date_x = width - 240
+        draw.rectangle([date_x, date_y, date_x+200, date_y+62],
+                      fill=(0, 0, 0, 153))
+        draw.rectangle([date_x, date_y, date_x+5, date_y+62],
+                      fill=(163, 42, 13, 255))
+
+    return img
+
+
+def _render_one(job: Dict) -> bool:
+    """Render a single overlay job (executor map target)."""
+    return SimpleOverlayRenderer.create_overlay(**job)
+
 
 class SimpleOverlayRenderer:
     """Create video overlays using Pillow instead of html2image."""
 
+    # (fmt, size, bold, fill, anchor) -> (date string, tile, paste offset)
+    _DATE_TILE_CACHE: dict = {}
+
     # Get the project's font directory
     FONTS_DIR = Path(__file__).parent.parent.parent / 'assets' / 'fonts'
 
     @staticmethod
     def _has_tamil(text: str) -> bool:
         """Return True if text contains any Tamil Unicode characters."""
-        return any('\u0B80' <= ch <= '\u0BFF' for ch in text)
+        return _TAMIL_RE.search(text) is not None
 
     @staticmethod
     def _load_font(size: int, bold: bool = True, text: str = "") -> ImageFont.FreeTypeFont:
         """
         Load the best font for the given text (Tamil or Latin).
         Works on both Windows and Linux (Render/Docker).
+
+        Path resolution and the parsed FreeType face are both cached, so
+        repeat renders reuse one face per (path, size) instead of
+        re-parsing the TTF on every overlay.
         """
-        fonts_dir = SimpleOverlayRenderer.FONTS_DIR
-
-        if SimpleOverlayRenderer._has_tamil(text):
-            # Tamil script — use project-bundled NotoSansTamil (always present)
-            candidates = [
-                str(fonts_dir / ("NotoSansTamil-Bold.ttf" if bold else "NotoSansTamil-Regular.ttf")),
-                str(fonts_dir / "NotoSansTamil-Regular.ttf"),
-                str(fonts_dir / "NotoSansTamil-Bold.ttf"),
-                # Windows fallback
-                "C:/Windows/Fonts/Nirmala.ttc",
-            ]
-        else:
-            # Latin / English
-            candidates = [
-                # Windows paths
-                "C:/Windows/Fonts/arialbd.ttf" if bold else "C:/Windows/Fonts/arial.ttf",
-                "C:/Windows/Fonts/arial.ttf",
-                "C:/Windows/Fonts/arialbd.ttf",
-                "C:/Windows/Fonts/Nirmala.ttc",
-                # Linux paths (Debian/Ubuntu — available on Render)
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-                "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-                "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-                "/usr/share/fonts/truetype/freefont/FreeSansBold.ttf" if bold else "/usr/share/fonts/truetype/freefont/FreeSans.ttf",
-                "/usr/share/fonts/truetype/freefont/FreeSans.ttf",
-                # NotoSans as last resort (covers Latin too)
-                str(fonts_dir / "NotoSansTamil-Bold.ttf"),
-                str(fonts_dir / "NotoSansTamil-Regular.ttf"),
-            ]
-
-        for font_path in candidates:
+        font_path = _resolve_font_path(SimpleOverlayRenderer._has_tamil(text), bold)
+        if font_path is not None:
             try:
-                if os.path.exists(font_path):
-                    font = ImageFont.truetype(font_path, size)
-                    print(f"   ✓ Loaded font: {os.path.basename(font_path)}")
-                    return font
+                return _get_font(font_path, size)
             except Exception:
-                continue
+                pass
 
-        print("⚠️ Warning: No suitable font found, using default")
+        logger.warning("No suitable font found, using default")
         return ImageFont.load_default()
 
     @staticmethod
@@ -75,7 +398,10 @@ class SimpleOverlayRenderer:
         location: Optional[str] = None,
         show_location: bool = True,
         width: int = 1080,
-        height: int = 1920
+        height: int = 1920,
+        scale: float = 1.0,
+        preview: bool = False,
+        date_str: Optional[str] = None
     ) -> bool:
         """
         Create overlay for any template.
@@ -88,101 +414,248 @@ class SimpleOverlayRenderer:
             show_location: Whether to show location
             width: Image width
             height: Image height
+            scale: Downscale factor for the saved image — render at the
+                native layout, then LANCZOS-resize before encoding.
+                Production renders should keep 1.0.
+            preview: Convenience flag for thumbnail workflows; sets
+                scale to 1/3 (360x640 for the default canvas)
+            date_str: Preformatted date to show instead of today's —
+                batch callers format once and share it across frames
 
         Returns:
             True if successful
         """
-        # Extract template number
-        template_num = template_name.replace('.html', '').replace('template', '')
+        # Extract template number and dispatch through the jump table
+        match = _TPL_RE.match(template_name)
+        template_num = match.group(1) if match else None
+        if preview:
+            scale = 1 / 3
+        if scale != 1.0:
+            # Preview path: PNG encode is O(pixels), so encoding at the
+            # reduced size is the bulk of the saving
+            render = SimpleOverlayRenderer._RENDERERS.get(template_num)
+            if render is None:
+                logger.error("Unknown template: %s", template_name)
+                return False
+            try:
+                img = render(headline, location, show_location, width, height,
+                             date_str)
+                img = img.resize(
+                    (max(1, int(width * scale)), max(1, int(height * scale))),
+                    RESAMPLE_LANCZOS
+                )
+                img.save(output_path, 'PNG', compress_level=1, optimize=False)
+                return True
+            except Exception:
+                logger.exception("Error creating %s preview", template_name)
+                return False
 
-        if template_num == '1':
-            return SimpleOverlayRenderer.create_template1_overlay(
-                output_path, headline, location, show_location, width, height
-            )
-        elif template_num == '2':
-            return SimpleOverlayRenderer.create_template2_overlay(
-                output_path, headline, location, show_location, width, height
-            )
-        elif template_num == '3':
-            return SimpleOverlayRenderer.create_template3_overlay(
-                output_path, headline, location, show_location, width, height
-            )
-        elif template_num == '4':
-            return SimpleOverlayRenderer.create_template4_overlay(
-                output_path, headline, location, show_location, width, height
-            )
-        else:
-            print(f"❌ Unknown template: {template_name}")
+        if template_num not in SimpleOverlayRenderer._RENDERERS:
+            logger.error("Unknown template: %s", template_name)
             return False
 
+        # Content-addressed cache: identical inputs on the same day
+        # produce identical pixels, so reuse the encoded PNG outright
+        key = (template_num, headline, location, show_location, width, height,
+               date_str or _today_str('%Y-%m-%d', int(time.time() // 60)))
+        cache_path = _overlay_cache_path(key)
+        try:
+            if os.path.exists(cache_path):
+                _link_or_copy(cache_path, output_path)
+                return True
+        except OSError:
+            pass  # cache is best effort; fall through and render
+
+        ok = SimpleOverlayRenderer._create_overlay_file(
+            template_num, output_path, headline, location, show_location,
+            width, height, date_str
+        )
+        if ok:
+            try:
+                os.makedirs(_OVERLAY_CACHE_DIR, exist_ok=True)
+                _link_or_copy(output_path, cache_path)
+            except OSError:
+                pass
+        return ok
+
+    @classmethod
+    def create_overlays_batch(cls, jobs: list) -> list:
+        """
+        Render many overlays across a thread pool.
+
+        Each job is a dict of create_overlay keyword arguments. Pillow's
+        draw, resize and encode paths release the GIL, so threads scale
+        across cores while sharing one set of font/chrome/tile caches —
+        no pickling and no interpreter spawn like a process pool would
+        pay. output_path must be unique per job; workers write
+        concurrently.
+
+        Returns:
+            Per-job success flags, in job order
+        """
+        if not jobs:
+            return []
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            return list(executor.map(_render_one, jobs))
+
     @staticmethod
-    def create_template1_overlay(
+    def create_overlay_raw(
+        template_name: str,
+        headline: str,
+        location: Optional[str] = None,
+        show_location: bool = True,
+        width: int = 1080,
+        height: int = 1920,
+        date_str: Optional[str] = None
+    ) -> Optional[bytes]:
+        """
+        Render an overlay and return raw RGBA pixels instead of saving
+        a PNG — for feeding ffmpeg directly via
+        `-f rawvideo -pixel_format rgba -video_size WxH -i -`,
+        skipping one PNG encode and one decode per frame.
+
+        Returns:
+            width*height*4 bytes, or None for an unknown template
+        """
+        match = _TPL_RE.match(template_name)
+        render = (
+            SimpleOverlayRenderer._RENDERERS.get(match.group(1)) if match else None
+        )
+        if render is None:
+            logger.error("Unknown template: %s", template_name)
+            return None
+        try:
+            return render(headline, location, show_location, width, height,
+                          date_str).tobytes()
+        except Exception:
+            logger.exception("Error rendering %s", template_name)
+            return None
+
+    @staticmethod
+    def render_and_pipe(ffmpeg_proc, job: Dict) -> bool:
+        """
+        Render one overlay job straight into an ffmpeg stdin pipe.
+
+        job is a dict of create_overlay_raw keyword arguments; the
+        ffmpeg process must read rawvideo RGBA at the job's size.
+        """
+        raw = SimpleOverlayRenderer.create_overlay_raw(**job)
+        if raw is None:
+            return False
+        ffmpeg_proc.stdin.write(raw)
+        return True
+
+    @staticmethod
+    def _create_overlay_file(
+        template_num: str,
         output_path: str,
         headline: str,
         location: Optional[str] = None,
         show_location: bool = True,
         width: int = 1080,
-        height: int = 1920
+        height: int = 1920,
+        date_str: Optional[str] = None
     ) -> bool:
-        """Template 1: Full Frame Golden."""
+        """
+        Shared render-save-report wrapper around the pure
+        _render_templateN builders — one code path for every template
+        instead of four copies of the same boilerplate.
+        """
+        render = SimpleOverlayRenderer._RENDERERS.get(template_num)
+        if render is None:
+            logger.error("Unknown template: template%s", template_num)
+            return False
         try:
-            img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-
-            loc_text_for_font = location or ""
-            font_headline = SimpleOverlayRenderer._load_font(52, bold=True, text=headline)
-            font_date = SimpleOverlayRenderer._load_font(36, bold=True, text="")
-            font_location = SimpleOverlayRenderer._load_font(38, bold=True, text=loc_text_for_font)
-            font_logo = SimpleOverlayRenderer._load_font(32, bold=True, text="")
-
-            # Golden gradient top bar (approximation)
-            gold_color = (255, 215, 0, 230)  # Golden
-            draw.rectangle([0, 0, width, 280], fill=gold_color)
-
-            # Logo box (top right)
-            logo_x, logo_y = width - 230, 40
-            draw.rectangle([logo_x, logo_y, logo_x+180, logo_y+70],
-                          fill=(255, 255, 255, 255), outline=gold_color, width=3)
-            draw.text((logo_x+90, logo_y+35), "NEWS", fill=gold_color,
-                     font=font_logo, anchor="mm")
-
-            # Date
-            current_date = datetime.now().strftime("%d %B %Y")
-            draw.text((60, 180), current_date, fill=(255, 255, 255, 255), font=font_date)
-
-            # Headline box (bottom)
-            headline_y = height - 450
-            headline_bg = (255, 255, 255, 242)
-            draw.rectangle([60, headline_y, width-60, headline_y+180],
-                          fill=headline_bg)
-            # Golden left border
-            draw.rectangle([60, headline_y, 70, headline_y+180], fill=gold_color)
-
-            # Headline text
-            headline_wrapped = SimpleOverlayRenderer._wrap_text(headline, font_headline, width-180)
-            draw.multiline_text((width//2, headline_y+90), headline_wrapped,
-                               fill=(44, 44, 44, 255), font=font_headline,
-                               anchor="mm", align="center")
-
-            # Location
-            if show_location and location:
-                loc_y = height - 180
-                loc_bg = (255, 215, 0, 242)
-                draw.ellipse([60, loc_y, 110, loc_y+50], fill=loc_bg)
-                draw.ellipse([width-110, loc_y, width-60, loc_y+50], fill=loc_bg)
-                draw.rectangle([85, loc_y, width-85, loc_y+50], fill=loc_bg)
-
-                loc_text = f"📍 {location}"
-                draw.text((width//2, loc_y+25), loc_text,
-                         fill=(44, 44, 44, 255), font=font_location, anchor="mm")
-
-            img.save(output_path, 'PNG')
-            print(f"✅ Created Template 1 overlay")
+            img = render(headline, location, show_location, width, height,
+                         date_str)
+            img.save(output_path, 'PNG', compress_level=1, optimize=False)
+            logger.info("Created Template %s overlay", template_num)
             return True
-        except Exception as e:
-            print(f"❌ Error creating Template 1: {e}")
+        except Exception:
+            logger.exception("Error creating Template %s", template_num)
             return False
 
+    @staticmethod
+    def _render_template1(
+        headline: str,
+        location: Optional[str] = None,
+        show_location: bool = True,
+        width: int = 1080,
+        height: int = 1920,
+        date_str: Optional[str] = None
+    ) -> Image.Image:
+        """Template 1: Full Frame Golden. Builds the image; no I/O."""
+        has_location = bool(show_location and location)
+        # Copy the cached chrome (one memcpy) and draw only the
+        # per-render text on top
+        img = _template_chrome('1', width, height, has_location).copy()
+        draw = ImageDraw.Draw(img)
+        cx = width // 2
+
+        # Date (cached daily tile)
+        _paste_date(img, draw, "%d %B %Y", 36, True, (255, 255, 255, 255),
+                    (60, 180), text=date_str)
+
+        # Headline text (cached tile; re-shaped only for new headlines)
+        headline_y = height - 450
+        _paste_headline(img, draw, headline, 52, True, (44, 44, 44, 255),
+                        width-180, (cx, headline_y+90))
+
+        # Location
+        if has_location:
+            font_location = SimpleOverlayRenderer._load_font(38, bold=True, text=location)
+            loc_y = height - 180
+            loc_text = f"📍 {location}"
+            draw.text((cx, loc_y+25), loc_text,
+                     fill=(44, 44, 44, 255), font=font_location, anchor="mm")
+        return img
+
+    @staticmethod
+    def create_template1_overlay(
+        output_path: str,
+        headline: str,
+        location: Optional[str] = None,
+        show_location: bool = True,
+        width: int = 1080,
+        height: int = 1920,
+        date_str: Optional[str] = None
+    ) -> bool:
+        """Template 1: Full Frame Golden."""
+        return SimpleOverlayRenderer._create_overlay_file(
+            '1', output_path, headline, location, show_location,
+            width, height, date_str
+        )
+
+    @staticmethod
+    def _render_template2(
+        headline: str,
+        location: Optional[str] = None,
+        show_location: bool = True,
+        width: int = 1080,
+        height: int = 1920,
+        date_str: Optional[str] = None
+    ) -> Image.Image:
+        """Template 2: Split Video Orange. Builds the image; no I/O."""
+        has_location = bool(show_location and location)
+        img = _template_chrome('2', width, height, has_location).copy()
+        draw = ImageDraw.Draw(img)
+        cx = width // 2
+
+        # Headline text (cached tile; re-shaped only for new headlines)
+        headline_y = height - 520
+        _paste_headline(img, draw, headline, 48, True, (255, 255, 255, 255),
+                        width-200, (cx, headline_y+85))
+
+        # Location and date in bottom bar
+        if has_location:
+            font_location = SimpleOverlayRenderer._load_font(36, bold=True, text=location)
+            draw.text((80, height-90), f"📍 {location}",
+                     fill=(255, 107, 53, 240), font=font_location)
+
+        _paste_date(img, draw, "%d %B %Y", 32, True, (255, 255, 255, 255),
+                    (width-80, height-90), anchor="rm", text=date_str)
+        return img
+
     @staticmethod
     def create_template2_overlay(
         output_path: str,
@@ -190,66 +663,48 @@ class SimpleOverlayRenderer:
         location: Optional[str] = None,
         show_location: bool = True,
         width: int = 1080,
-        height: int = 1920
+        height: int = 1920,
+        date_str: Optional[str] = None
     ) -> bool:
         """Template 2: Split Video Orange."""
-        try:
-            img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-
-            loc_text_for_font = location or ""
-            font_headline = SimpleOverlayRenderer._load_font(48, bold=True, text=headline)
-            font_logo = SimpleOverlayRenderer._load_font(48, bold=True, text="")
-            font_date = SimpleOverlayRenderer._load_font(32, bold=True, text="")
-            font_location = SimpleOverlayRenderer._load_font(36, bold=True, text=loc_text_for_font)
-
-            # Orange top bar
-            orange_color = (255, 107, 53, 240)
-            draw.rectangle([0, 0, width, 180], fill=orange_color)
-
-            # Logo text
-            draw.text((80, 50), "NEWS BROADCAST", fill=(255, 255, 255, 255),
-                     font=font_logo)
-
-            # LIVE indicator
-            live_bg = (255, 0, 0, 255)
-            draw.ellipse([width-180, 35, width-80, 75], fill=live_bg)
-            draw.text((width-130, 55), "● LIVE", fill=(255, 255, 255, 255),
-                     font=font_date, anchor="mm")
-
-            # Headline box (below video area)
-            headline_y = height - 520
-            headline_bg = (255, 107, 53, 242)
-            draw.rectangle([80, headline_y, width-80, headline_y+170],
-                          fill=headline_bg)
-
-            # Headline text
-            headline_wrapped = SimpleOverlayRenderer._wrap_text(headline, font_headline, width-200)
-            draw.multiline_text((width//2, headline_y+85), headline_wrapped,
-                               fill=(255, 255, 255, 255), font=font_headline,
-                               anchor="mm", align="center")
-
-            # Bottom bar
-            bottom_bg = (45, 45, 45, 240)
-            draw.rectangle([0, height-150, width, height], fill=bottom_bg)
-            # Orange top border
-            draw.rectangle([0, height-154, width, height-150], fill=orange_color)
-
-            # Location and date in bottom bar
-            if show_location and location:
-                draw.text((80, height-90), f"📍 {location}",
-                         fill=orange_color, font=font_location)
-
-            current_date = datetime.now().strftime("%d %B %Y")
-            draw.text((width-80, height-90), current_date,
-                     fill=(255, 255, 255, 255), font=font_date, anchor="rm")
-
-            img.save(output_path, 'PNG')
-            print(f"✅ Created Template 2 overlay")
-            return True
-        except Exception as e:
-            print(f"❌ Error creating Template 2: {e}")
-            return False
+        return SimpleOverlayRenderer._create_overlay_file(
+            '2', output_path, headline, location, show_location,
+            width, height, date_str
+        )
+
+    @staticmethod
+    def _render_template3(
+        headline: str,
+        location: Optional[str] = None,
+        show_location: bool = True,
+        width: int = 1080,
+        height: int = 1920,
+        date_str: Optional[str] = None
+    ) -> Image.Image:
+        """Template 3: Minimal Modern. Builds the image; no I/O."""
+        has_location = bool(show_location and location)
+        img = _template_chrome('3', width, height, has_location).copy()
+        draw = ImageDraw.Draw(img)
+        cx = width // 2
+
+        # Date badge text (top right, cached daily tile)
+        date_x, date_y = width - 220, 40
+        _paste_date(img, draw, "%d %B %Y", 26, False, (255, 255, 255, 255),
+                    (date_x+90, date_y+25), anchor="mm", text=date_str)
+
+        # Headline text (cached tile; re-shaped only for new headlines)
+        headline_y = height - 520
+        _paste_headline(img, draw, headline, 50, False, (26, 26, 26, 255),
+                        width-180, (cx, headline_y+95))
+
+        # Location
+        if has_location:
+            font_location = SimpleOverlayRenderer._load_font(30, bold=False, text=location)
+            loc_y = height - 240
+            loc_text = f"📍 {location}"
+            draw.text((cx, loc_y+25), loc_text,
+                     fill=(255, 255, 255, 255), font=font_location, anchor="mm")
+        return img
 
     @staticmethod
     def create_template3_overlay(
@@ -258,65 +713,77 @@ class SimpleOverlayRenderer:
         location: Optional[str] = None,
         show_location: bool = True,
         width: int = 1080,
-        height: int = 1920
+        height: int = 1920,
+        date_str: Optional[str] = None
     ) -> bool:
         """Template 3: Minimal Modern."""
-        try:
-            img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-
-            loc_text_for_font = location or ""
-            font_headline = SimpleOverlayRenderer._load_font(50, bold=False, text=headline)
-            font_date = SimpleOverlayRenderer._load_font(26, bold=False, text="")
-            font_location = SimpleOverlayRenderer._load_font(30, bold=False, text=loc_text_for_font)
-
-            # Top line
-            draw.rectangle([0, 0, width, 6], fill=(0, 0, 0, 255))
-
-            # Date badge (top right)
-            date_x, date_y = width - 220, 40
-            date_bg = (0, 0, 0, 217)
-            draw.rectangle([date_x, date_y, date_x+180, date_y+50],
-                          fill=date_bg)
-            current_date = datetime.now().strftime("%d %B %Y")
-            draw.text((date_x+90, date_y+25), current_date,
-                     fill=(255, 255, 255, 255), font=font_date, anchor="mm")
-
-            # Headline box
-            headline_y = height - 520
-            headline_bg = (255, 255, 255, 242)
-            draw.rectangle([60, headline_y, width-60, headline_y+190],
-                          fill=headline_bg)
-            # Black left border
-            draw.rectangle([60, headline_y, 68, headline_y+190], fill=(0, 0, 0, 255))
-
-            # Headline text
-            headline_wrapped = SimpleOverlayRenderer._wrap_text(headline, font_headline, width-180)
-            draw.multiline_text((width//2, headline_y+95), headline_wrapped,
-                               fill=(26, 26, 26, 255), font=font_headline,
-                               anchor="mm", align="center")
-
-            # Location
-            if show_location and location:
-                loc_y = height - 240
-                loc_bg = (0, 0, 0, 217)
-                draw.ellipse([60, loc_y, 110, loc_y+50], fill=loc_bg)
-                draw.ellipse([width-110, loc_y, width-60, loc_y+50], fill=loc_bg)
-                draw.rectangle([85, loc_y, width-85, loc_y+50], fill=loc_bg)
-
-                loc_text = f"📍 {location}"
-                draw.text((width//2, loc_y+25), loc_text,
-                         fill=(255, 255, 255, 255), font=font_location, anchor="mm")
-
-            # Bottom accent
-            draw.rectangle([60, height-40, 260, height-36], fill=(0, 0, 0, 255))
-
-            img.save(output_path, 'PNG')
-            print(f"✅ Created Template 3 overlay")
-            return True
-        except Exception as e:
-            print(f"❌ Error creating Template 3: {e}")
-            return False
+        return SimpleOverlayRenderer._create_overlay_file(
+            '3', output_path, headline, location, show_location,
+            width, height, date_str
+        )
+
+    @staticmethod
+    def _render_template4(
+        headline: str,
+        location: Optional[str] = None,
+        show_location: bool = True,
+        width: int = 1080,
+        height: int = 1920,
+        date_str: Optional[str] = None
+    ) -> Image.Image:
+        """Template 4: Tiruvarur Updates - NEW DESIGN matching HTML. Builds the image; no I/O."""
+        has_location = bool(show_location and location)
+        # Borders, header, logo and date-box background come baked
+        # into the chrome; only the text (and the variable-width
+        # location box) is drawn per render
+        img = _template_chrome('4', width, height, has_location).copy()
+        draw = ImageDraw.Draw(img)
+        cx = width // 2
+
+        # Headline text in header (cached tile; re-shaped only for new
+        # headlines)
+        header_height = 300
+        _paste_headline(img, draw, headline, 55, True, (255, 255, 255, 255),
+                        width-100, (cx, header_height//2))
+
+        # Location box (bottom left) — width depends on the text, so
+        # the whole box stays on the dynamic path
+        if has_location:
+            loc_y = height - 100
+            loc_x = 40
+
+            # Load smaller font for location (match language of location text)
+            font_location_small = SimpleOverlayRenderer._load_font(28, bold=True, text=location)
+
+            # Calculate text width with smaller font (single shaping
+            # call — no throwaway Image/Draw needed)
+            loc_text = f"📍 {location}"
+            text_width = int(font_location_small.getlength(loc_text))
+
+            # Dynamic box width (minimum 300px, maximum 600px to match HTML)
+            loc_width = min(max(text_width + 80, 300), 600)
+            loc_height = 62
+
+            # Background with rounded left side, straight right side,
+            # filled and outlined in one rasterization pass instead of
+            # ellipse + rectangle + four border draws
+            loc_bg = (163, 42, 13, 255)  # #a32a0d
+            draw.rounded_rectangle(
+                [loc_x, loc_y, loc_x+loc_width, loc_y+loc_height],
+                radius=31, corners=(True, False, False, True),
+                fill=loc_bg, outline=(255, 255, 255, 255), width=2
+            )
+
+            # Location text (using smaller font to match HTML 28px)
+            draw.text((loc_x+loc_width//2, loc_y+31), loc_text,
+                     fill=(255, 255, 255, 255), font=font_location_small, anchor="mm")
+
+        # Date text (cached daily tile; box background is in the chrome)
+        date_y = height - 100
+        date_x = width - 240
+        _paste_date(img, draw, "%d-%m-%Y", 32, True, (255, 255, 255, 255),
+                    (date_x+100, date_y+31), anchor="mm", text=date_str)
+        return img
 
     @staticmethod
     def create_template4_overlay(
@@ -325,176 +792,54 @@ class SimpleOverlayRenderer:
         location: Optional[str] = None,
         show_location: bool = True,
         width: int = 1080,
-        height: int = 1920
+        height: int = 1920,
+        date_str: Optional[str] = None
     ) -> bool:
         """Template 4: Tiruvarur Updates - NEW DESIGN matching HTML."""
-        try:
-            # Create transparent image
-            img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-
-            # Colors from new HTML design
-            border_color = (122, 32, 13, 255)  # #7a200d
-            header_color = (122, 32, 13, 255)  # #7a200d (same as border)
-            header_bottom_border = (92, 26, 26, 255)  # #5c1a1a
-
-            loc_text_for_font = location or ""
-            font_headline = SimpleOverlayRenderer._load_font(55, bold=True, text=headline)
-            font_location = SimpleOverlayRenderer._load_font(32, bold=True, text=loc_text_for_font)
-            font_date = SimpleOverlayRenderer._load_font(32, bold=True, text="")
-
-            # 1. Draw border frame (sides and bottom only)
-            border_width = 20
-            # Left border
-            draw.rectangle([0, 0, border_width, height], fill=border_color)
-            # Right border
-            draw.rectangle([width-border_width, 0, width, height], fill=border_color)
-            # Bottom border
-            draw.rectangle([0, height-border_width, width, height], fill=border_color)
-
-            # 2. Draw red header block at top (starts from very top)
-            header_height = 300
-            header_y = 0
-
-            # Draw rounded rectangle for header
-            draw.rectangle([border_width, header_y, width-border_width, header_y+header_height],
-                          fill=header_color)
-
-            # Add bottom border to header
-            draw.rectangle([border_width, header_y+header_height-4, width-border_width, header_y+header_height],
-                          fill=header_bottom_border)
-
-            # 3. Draw headline text in header (centered, white text)
-            headline_wrapped = SimpleOverlayRenderer._wrap_text(headline, font_headline, width-100)
-
-            # Calculate text position (centered in header)
-            text_y = header_y + header_height//2
-
-            draw.multiline_text((width//2, text_y), headline_wrapped,
-                               fill=(255, 255, 255, 255), font=font_headline,
-                               anchor="mm", align="center")
-
-            # 4. Load and place logo (top right, below header)
-            logo_path = Path(__file__).parent.parent.parent / 'assets' / 'tiruvarur_logo.png'
-            if logo_path.exists():
-                try:
-                    logo = Image.open(logo_path)
-                    logo = logo.resize((130, 130), Image.Resampling.LANCZOS)
-
-                    # Create circular mask
-                    mask = Image.new('L', (130, 130), 0)
-                    mask_draw = ImageDraw.Draw(mask)
-                    mask_draw.ellipse([0, 0, 130, 130], fill=255)
-
-                    # Position: below header, top right
-                    logo_x = width - 40 - 130  # 40px from right
-                    logo_y = header_y + header_height + 30  # 30px below header
-
-                    # Paste with circular mask
-                    img.paste(logo, (logo_x, logo_y), mask)
-
-                    # Draw white border around logo
-                    mask_draw2 = ImageDraw.Draw(img)
-                    mask_draw2.ellipse([logo_x-2, logo_y-2, logo_x+132, logo_y+132],
-                                      outline=(255, 255, 255, 255), width=4)
-
-                    print(f"   Logo added at ({logo_x}, {logo_y})")
-                except Exception as e:
-                    print(f"   Logo error: {e}")
-
-            # 5. Location box (bottom left)
-            if show_location and location:
-                loc_y = height - 100
-                loc_x = 40
-
-                # Load smaller font for location (match language of location text)
-                font_location_small = SimpleOverlayRenderer._load_font(28, bold=True, text=location)
-
-                # Calculate text width with smaller font
-                loc_text = f"📍 {location}"
-                test_img = Image.new('RGB', (1, 1))
-                test_draw = ImageDraw.Draw(test_img)
-                bbox = test_draw.textbbox((0, 0), loc_text, font=font_location_small)
-                text_width = bbox[2] - bbox[0]
-
-                # Dynamic box width (minimum 300px, maximum 600px to match HTML)
-                loc_width = min(max(text_width + 80, 300), 600)
-                loc_height = 62
-
-                # Draw background with rounded left side, straight right side
-                loc_bg = (163, 42, 13, 255)  # #a32a0d
-                draw.ellipse([loc_x, loc_y, loc_x+60, loc_y+loc_height], fill=loc_bg)
-                draw.rectangle([loc_x+30, loc_y, loc_x+loc_width, loc_y+loc_height], fill=loc_bg)
-
-                # White border on left rounded side
-                draw.ellipse([loc_x-1, loc_y-1, loc_x+61, loc_y+loc_height+1], outline=(255, 255, 255, 255), width=2)
-                # White border on top, right, bottom edges
-                draw.line([loc_x+30, loc_y, loc_x+loc_width, loc_y], fill=(255, 255, 255, 255), width=2)
-                draw.line([loc_x+loc_width, loc_y, loc_x+loc_width, loc_y+loc_height], fill=(255, 255, 255, 255), width=2)
-                draw.line([loc_x+30, loc_y+loc_height, loc_x+loc_width, loc_y+loc_height], fill=(255, 255, 255, 255), width=2)
-
-                # Location text (using smaller font to match HTML 28px)
-                draw.text((loc_x+loc_width//2, loc_y+31), loc_text,
-                         fill=(255, 255, 255, 255), font=font_location_small, anchor="mm")
-
-            # 6. Date box (bottom right)
-            from datetime import datetime
-            current_date = datetime.now().strftime("%d-%m-%Y")
-
-            date_y = height - 100
-            date_x = width - 240
-            date_width = 200
-            date_height = 62
-
-            # Semi-transparent black background
-            date_bg = (0, 0, 0, 153)  # 0.6 opacity
-            draw.rectangle([date_x, date_y, date_x+date_width, date_y+date_height],
-                          fill=date_bg)
-
-            # Red left border accent
-            draw.rectangle([date_x, date_y, date_x+5, date_y+date_height],
-                          fill=(163, 42, 13, 255))
-
-            # Date text
-            draw.text((date_x+date_width//2, date_y+date_height//2), current_date,
-                     fill=(255, 255, 255, 255), font=font_date, anchor="mm")
-
-            # Save
-            img.save(output_path, 'PNG')
-            print(f"Created Template 4 (Tiruvarur Updates - New Design)")
-            return True
-
-        except Exception as e:
-            print(f"Error creating Template 4: {e}")
-            import traceback
-            traceback.print_exc()
-            return False
+        return SimpleOverlayRenderer._create_overlay_file(
+            '4', output_path, headline, location, show_location,
+            width, height, date_str
+        )
 
     @staticmethod
     def _wrap_text(text: str, font, max_width: int) -> str:
-        """Wrap text to fit within max_width."""
+        """
+        Wrap text to fit within max_width.
+
+        Each word is measured once with font.getlength and line widths
+        are accumulated incrementally — the old approach re-shaped the
+        whole joined line (via a throwaway Image/Draw and textbbox) for
+        every word, which was quadratic in headline length.
+        """
         words = text.split()
         lines = []
         current_line = []
+        current_w = 0.0
+        space_w = font.getlength(' ')
 
         for word in words:
-            current_line.append(word)
-            # Create a dummy draw to measure text
-            test_img = Image.new('RGB', (1, 1))
-            test_draw = ImageDraw.Draw(test_img)
-            bbox = test_draw.textbbox((0, 0), ' '.join(current_line), font=font)
-            width = bbox[2] - bbox[0]
-
-            if width > max_width:
-                if len(current_line) == 1:
-                    lines.append(current_line[0])
-                    current_line = []
-                else:
-                    current_line.pop()
-                    lines.append(' '.join(current_line))
-                    current_line = [word]
+            word_w = font.getlength(word)
+            added = word_w + (space_w if current_line else 0)
+            if current_line and current_w + added > max_width:
+                lines.append(' '.join(current_line))
+                current_line = [word]
+                current_w = word_w
+            else:
+                current_line.append(word)
+                current_w += added
 
         if current_line:
             lines.append(' '.join(current_line))
 
         return '\n'.join(lines)
+
+
+# Template-number → renderer jump table, resolved once at import so
+# dispatch is a dict lookup instead of string surgery + if/elif. Both the
+# PNG and the raw paths go through this single table.
+SimpleOverlayRenderer._RENDERERS = {
+    '1': SimpleOverlayRenderer._render_template1,
+    '2': SimpleOverlayRenderer._render_template2,
+    '3': SimpleOverlayRenderer._render_template3,
+    '4': SimpleOverlayRenderer._render_template4,
+}
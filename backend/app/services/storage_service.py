@@ -1,5 +1,6 @@
 """File storage service — supports both AWS S3 and local filesystem."""
 
+import asyncio
 import os
 import uuid
 import tempfile
@@ -7,11 +8,16 @@ import aiofiles
 from pathlib import Path
 from typing import Tuple, Optional
 from fastapi import UploadFile, HTTPException, status
-from app.config import settings
+from app.config import get_settings
+
+# Multipart upload tuning — 8MB parts, at most 4 in flight at once
+S3_PART_SIZE = 8 * 1024 * 1024
+S3_MAX_CONCURRENT_PARTS = 4
 
 
 def _get_s3_client():
     import boto3
+    settings = get_settings()
     return boto3.client(
         "s3",
         region_name=settings.AWS_REGION,
@@ -20,6 +26,16 @@ def _get_s3_client():
     )
 
 
+def _get_aioboto3_session():
+    import aioboto3
+    settings = get_settings()
+    return aioboto3.Session(
+        region_name=settings.AWS_REGION,
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+    )
+
+
 class StorageService:
     """Service for managing video file storage (S3 or local)."""
 
@@ -69,44 +85,44 @@ class StorageService:
         """
         StorageService.validate_video_file(file)
 
+        settings = get_settings()
         if not video_id:
             video_id = str(uuid.uuid4())
 
         file_ext = Path(file.filename).suffix.lower()
         filename = f"{video_id}{file_ext}"
 
-        # Read entire file into memory (chunked) to get size + content
-        chunks = []
-        file_size = 0
-        while chunk := await file.read(8192):
-            file_size += len(chunk)
-            if file_size > settings.MAX_FILE_SIZE:
-                raise HTTPException(
-                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                    detail=f"File too large. Max: {settings.MAX_FILE_SIZE // (1024*1024)}MB"
-                )
-            chunks.append(chunk)
-        data = b"".join(chunks)
-
         if settings.use_s3:
+            # Stream the request body straight to S3 — no local disk,
+            # no full in-memory copy
             s3_key = f"{settings.S3_UPLOAD_PREFIX}/{filename}"
             try:
-                s3 = _get_s3_client()
-                s3.put_object(
-                    Bucket=settings.S3_BUCKET_NAME,
-                    Key=s3_key,
-                    Body=data,
-                    ContentType=file.content_type,
+                file_size = await StorageService._stream_to_s3_multipart(
+                    file, s3_key, file.content_type
                 )
                 storage_path = f"s3://{settings.S3_BUCKET_NAME}/{s3_key}"
-                print(f"   ✅ Uploaded to S3: {s3_key}")
+                print(f"   ✅ Uploaded to S3 (multipart): {s3_key}")
                 return video_id, storage_path, file_size
+            except HTTPException:
+                raise
             except Exception as e:
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail=f"S3 upload failed: {e}"
                 )
         else:
+            # Read entire file into memory (chunked) to get size + content
+            chunks = []
+            file_size = 0
+            while chunk := await file.read(8192):
+                file_size += len(chunk)
+                if file_size > settings.MAX_FILE_SIZE:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File too large. Max: {settings.MAX_FILE_SIZE // (1024*1024)}MB"
+                    )
+                chunks.append(chunk)
+            data = b"".join(chunks)
             upload_dir = settings.upload_path
             upload_dir.mkdir(parents=True, exist_ok=True)
             file_path = upload_dir / filename
@@ -122,6 +138,77 @@ class StorageService:
                     detail=f"Failed to save file: {e}"
                 )
 
+    @staticmethod
+    async def _stream_to_s3_multipart(file: UploadFile, s3_key: str, content_type: str) -> int:
+        """
+        Stream an upload to S3 with a multipart upload.
+        Parts are uploaded concurrently (bounded) while the next chunk is read.
+        Returns total bytes uploaded.
+        """
+        settings = get_settings()
+        bucket = settings.S3_BUCKET_NAME
+        session = _get_aioboto3_session()
+        sem = asyncio.Semaphore(S3_MAX_CONCURRENT_PARTS)
+
+        async with session.client("s3") as s3:
+            mpu = await s3.create_multipart_upload(
+                Bucket=bucket, Key=s3_key, ContentType=content_type
+            )
+            upload_id = mpu["UploadId"]
+
+            async def _upload_part(part_number: int, body: bytes) -> dict:
+                try:
+                    resp = await s3.upload_part(
+                        Bucket=bucket, Key=s3_key, UploadId=upload_id,
+                        PartNumber=part_number, Body=body
+                    )
+                    return {"PartNumber": part_number, "ETag": resp["ETag"]}
+                finally:
+                    sem.release()
+
+            tasks = []
+            file_size = 0
+            part_number = 0
+            try:
+                # Acquire before reading the next chunk so at most
+                # S3_MAX_CONCURRENT_PARTS part bodies are held in memory
+                # at once — without this, a slow S3 link lets the read
+                # loop buffer the whole file in queued tasks
+                while True:
+                    await sem.acquire()
+                    chunk = await file.read(S3_PART_SIZE)
+                    if not chunk:
+                        sem.release()
+                        break
+                    file_size += len(chunk)
+                    if file_size > settings.MAX_FILE_SIZE:
+                        sem.release()
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"File too large. Max: {settings.MAX_FILE_SIZE // (1024*1024)}MB"
+                        )
+                    part_number += 1
+                    tasks.append(asyncio.create_task(_upload_part(part_number, chunk)))
+
+                parts = await asyncio.gather(*tasks)
+                await s3.complete_multipart_upload(
+                    Bucket=bucket, Key=s3_key, UploadId=upload_id,
+                    MultipartUpload={"Parts": sorted(parts, key=lambda p: p["PartNumber"])}
+                )
+            except Exception:
+                for t in tasks:
+                    t.cancel()
+                # Let in-flight parts actually finish cancelling before the
+                # abort, so none race it (and none leave unretrieved
+                # exceptions behind)
+                await asyncio.gather(*tasks, return_exceptions=True)
+                await s3.abort_multipart_upload(
+                    Bucket=bucket, Key=s3_key, UploadId=upload_id
+                )
+                raise
+
+        return file_size
+
     # ------------------------------------------------------------------ #
     #  Download to local temp (for ffmpeg / Gemini processing)            #
     # ------------------------------------------------------------------ #
@@ -159,6 +246,7 @@ class StorageService:
         Upload a locally-processed video to S3 (or keep it local).
         Returns the final storage_path.
         """
+        settings = get_settings()
         if settings.use_s3:
             filename = f"{video_id}_processed.mp4"
             s3_key = f"{settings.S3_PROCESSED_PREFIX}/{filename}"
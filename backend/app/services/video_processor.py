@@ -7,7 +7,7 @@ import ffmpeg
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
-from app.config import settings
+from app.config import get_settings
 
 
 class VideoProcessor:
@@ -0,0 +1,71 @@
+"""Optional Arq task queue for heavy video jobs.
+
+When REDIS_URL is configured, analysis/render jobs are enqueued to Redis
+and executed by dedicated worker processes instead of FastAPI's
+in-process BackgroundTasks, keeping the API responsive under load.
+
+Run a worker with:
+    arq app.task_queue.WorkerSettings
+"""
+
+from app.config import get_settings
+from app.workers import (
+    analyze_video_task,
+    regenerate_ai_suggestions_task,
+    render_video_task,
+)
+
+
+async def analyze_video(ctx, video_id: str) -> bool:
+    """Arq wrapper for the analysis task."""
+    return await analyze_video_task(video_id)
+
+
+async def render_video(ctx, video_id: str) -> bool:
+    """Arq wrapper for the render task."""
+    return await render_video_task(video_id)
+
+
+async def regenerate_ai_suggestions(ctx, video_id: str) -> bool:
+    """Arq wrapper for the AI suggestion regeneration task."""
+    return await regenerate_ai_suggestions_task(video_id)
+
+
+async def create_arq_pool():
+    """
+    Create an Arq Redis pool if REDIS_URL is configured.
+    Returns None (and the API falls back to BackgroundTasks) otherwise.
+    """
+    settings = get_settings()
+    if not settings.REDIS_URL:
+        return None
+
+    try:
+        from arq import create_pool
+        from arq.connections import RedisSettings
+
+        pool = await create_pool(RedisSettings.from_dsn(settings.REDIS_URL))
+        print(f"✓ Arq task queue connected: {settings.REDIS_URL}")
+        return pool
+    except Exception as e:
+        print(f"⚠️ Arq queue unavailable ({e}), using in-process background tasks")
+        return None
+
+
+class WorkerSettings:
+    """Arq worker configuration (used by the `arq` CLI)."""
+
+    functions = [analyze_video, render_video, regenerate_ai_suggestions]
+    redis_settings = None  # resolved below when REDIS_URL is configured
+
+
+try:
+    from arq.connections import RedisSettings as _RedisSettings
+
+    _redis_url = get_settings().REDIS_URL
+    if _redis_url:
+        WorkerSettings.redis_settings = _RedisSettings.from_dsn(_redis_url)
+except Exception:
+    # arq not installed or settings unavailable — the API falls back
+    # to BackgroundTasks and the worker CLI will report its own error
+    pass
@@ -1,7 +1,7 @@
 """Utility helper functions."""
 
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
@@ -184,7 +184,7 @@ def log_task_start(task_name: str, video_id: str) -> None:
     print(f"\n{'='*60}")
     print(f"🚀 Starting: {task_name}")
     print(f"   Video ID: {video_id}")
-    print(f"   Time: {datetime.utcnow().isoformat()}")
+    print(f"   Time: {datetime.now(timezone.utc).isoformat()}")
     print(f"{'='*60}\n")
 
 
@@ -196,7 +196,7 @@ def log_task_complete(task_name: str, video_id: str, success: bool = True) -> No
     print(f"\n{'='*60}")
     print(f"{icon} {status}: {task_name}")
     print(f"   Video ID: {video_id}")
-    print(f"   Time: {datetime.utcnow().isoformat()}")
+    print(f"   Time: {datetime.now(timezone.utc).isoformat()}")
     print(f"{'='*60}\n")
 
 
@@ -204,4 +204,4 @@ def log_error(context: str, error: Exception) -> None:
     """Log error with context."""
     print(f"\n❌ ERROR in {context}:")
     print(f"   {type(error).__name__}: {str(error)}")
-    print(f"   Time: {datetime.utcnow().isoformat()}\n")
+    print(f"   Time: {datetime.now(timezone.utc).isoformat()}\n")
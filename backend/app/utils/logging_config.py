@@ -0,0 +1,36 @@
+"""Non-blocking logging setup using a queue handler/listener pair."""
+
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+_listener: QueueListener = None
+
+
+def setup_logging(level: int = logging.INFO) -> None:
+    """
+    Route all logging through an in-memory queue drained by a background
+    thread, so log I/O (stdout flushes in containers are synchronous)
+    never stalls the event loop. Safe to call more than once.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue = queue.Queue(-1)
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.handlers.clear()
+    root.addHandler(QueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -1,6 +1,6 @@
 """Background task workers for video processing."""
 
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
@@ -47,7 +47,7 @@ async def analyze_video_task(video_id: str) -> bool:
             {
                 "$set": {
                     "status": VideoStatus.ANALYZING,
-                    "updated_at": datetime.utcnow()
+                    "updated_at": datetime.now(timezone.utc)
                 }
             }
         )
@@ -82,7 +82,7 @@ async def analyze_video_task(video_id: str) -> bool:
                     "visual_analysis": visual.model_dump(),
                     "headline": headline.model_dump(),
                     "location": location.model_dump() if location.text else None,
-                    "updated_at": datetime.utcnow()
+                    "updated_at": datetime.now(timezone.utc)
                 }
             }
         )
@@ -101,7 +101,7 @@ async def analyze_video_task(video_id: str) -> bool:
                 "$set": {
                     "status": VideoStatus.ERROR,
                     "error_message": f"Analysis failed: {str(e)}",
-                    "updated_at": datetime.utcnow()
+                    "updated_at": datetime.now(timezone.utc)
                 }
             }
         )
@@ -168,7 +168,7 @@ async def regenerate_ai_suggestions_task(video_id: str) -> bool:
                 "$set": {
                     "headline": headline.model_dump(),
                     "location": location.model_dump() if location.text else None,
-                    "updated_at": datetime.utcnow()
+                    "updated_at": datetime.now(timezone.utc)
                 }
             }
         )
@@ -220,7 +220,7 @@ async def render_video_task(video_id: str) -> bool:
             {
                 "$set": {
                     "status": VideoStatus.RENDERING,
-                    "updated_at": datetime.utcnow()
+                    "updated_at": datetime.now(timezone.utc)
                 }
             }
         )
@@ -287,7 +287,7 @@ async def render_video_task(video_id: str) -> bool:
                 "$set": {
                     "status": VideoStatus.COMPLETED,
                     "processed_path": final_storage_path,
-                    "updated_at": datetime.utcnow()
+                    "updated_at": datetime.now(timezone.utc)
                 }
             }
         )
@@ -308,7 +308,7 @@ async def render_video_task(video_id: str) -> bool:
                 "$set": {
                     "status": VideoStatus.ERROR,
                     "error_message": f"Rendering failed: {str(e)}",
-                    "updated_at": datetime.utcnow()
+                    "updated_at": datetime.now(timezone.utc)
                 }
             }
         )
@@ -333,7 +333,7 @@ async def cleanup_old_videos(days: int = 7) -> int:
         collection = get_videos_collection()
         from datetime import timedelta
 
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
 
         # Find old completed videos
         old_videos = await collection.find({
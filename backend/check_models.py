@@ -1,6 +1,8 @@
 """Quick script to list available Gemini models."""
 import google.generativeai as genai
-from app.config import settings
+from app.config import get_settings
+
+settings = get_settings()
 
 # Configure API
 genai.configure(api_key=settings.GEMINI_API_KEY)
@@ -1,6 +1,8 @@
 """Test video upload to Gemini."""
 import google.generativeai as genai
-from app.config import settings
+from app.config import get_settings
+
+settings = get_settings()
 from pathlib import Path
 
 # Configure API